@@ -0,0 +1,60 @@
+import ast
+
+# Traversal helpers shared by PatternDetector and EnhancedCodeVisitor, so both
+# analyzers walk the tree the same way.
+#
+# ast node classes are never subclassed, so the walkers and their handlers
+# dispatch on exact type(), through dicts and sets keyed by node class: the
+# checks are complete and skip isinstance's MRO walk
+
+# Node types the walker never descends into: leaves, operator/context markers and
+# parameter lists (annotations/defaults), none of which hold loops, defs or calls
+# that the pattern rules care about
+SKIP_TYPES = frozenset(
+    [ast.Constant, ast.Name, ast.arguments, ast.arg, ast.alias]
+    + [cls
+       for base in (ast.expr_context, ast.boolop, ast.operator, ast.unaryop, ast.cmpop)
+       for cls in base.__subclasses__()]
+)
+
+# Fields worth walking for node types where the rest can never matter: a def's
+# decorators, parameters and return annotation run once in the enclosing scope,
+# not per call, and an annotated assignment's annotation is only a type
+WALK_FIELDS = {
+    ast.FunctionDef: ("body",),
+    ast.AsyncFunctionDef: ("body",),
+    ast.AnnAssign: ("target", "value"),
+}
+
+# Division operators that mark a halving step (n // 2, n / 2, n //= 2)
+DIV_OPS = frozenset({ast.FloorDiv, ast.Div})
+
+
+def build_dispatch(cls) -> dict:
+    """Map AST node classes to the visit_* handlers defined on cls."""
+    dispatch = {}
+    for name, handler in vars(cls).items():
+        if name.startswith("visit_"):
+            node_cls = getattr(ast, name[len("visit_"):], None)
+            if isinstance(node_cls, type) and issubclass(node_cls, ast.AST):
+                dispatch[node_cls] = handler
+    return dispatch
+
+
+def child_nodes(node: ast.AST) -> list:
+    """Walkable children of node (anything not in SKIP_TYPES), in field (source) order."""
+    children = []
+    for field in WALK_FIELDS.get(type(node), node._fields):
+        value = getattr(node, field, None)
+        if isinstance(value, list):
+            for child in value:
+                if isinstance(child, ast.AST) and type(child) not in SKIP_TYPES:
+                    children.append(child)
+        elif isinstance(value, ast.AST) and type(value) not in SKIP_TYPES:
+            children.append(value)
+    return children
+
+
+def push_children(stack: list, node: ast.AST) -> None:
+    """Push node's walkable children onto stack in reverse, so they pop in source order."""
+    stack.extend(reversed(child_nodes(node)))
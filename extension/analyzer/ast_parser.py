@@ -1,56 +1,168 @@
 import ast
-import requests
-from typing import List, Optional, Tuple
-from .models import FunctionAnalysis
+import hashlib
+import json
+import os
+import sys
+import requests  # type: ignore[import-untyped]
+from collections import OrderedDict
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, Union, cast
+from ._scan import DIV_OPS, build_dispatch, push_children
+from .models import (
+    O_1, O_2_N, O_LOG_N, O_N, O_N_LOG_N, O_SQRT_N, O_UNKNOWN, FunctionAnalysis,
+)
 
-# Pattern detection rules
-def detect_patterns_ast(code: str) -> Optional[Tuple[str, str, int, int]]:
-    """Detect common complexity patterns using simple AST rules. Returns (time, space, loops, recursions) or None if no pattern matches."""
-    try:        
-        tree = ast.parse(code)
-        visitor = PatternDetector()
-        visitor.visit(tree)
-        
-        # Check patterns in order of specificity
-        time_comp, space_comp, loops, recursions = visitor.get_result()
-        
-        # If we detected something, return it
-        if time_comp and time_comp != "O(?)":
-            return (time_comp, space_comp, loops, recursions)
-        
-        return None
-    except:
+def _cache_dir() -> Path:
+    """Per-user cache directory, under $XDG_CACHE_HOME when that is an absolute path."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    root = Path(base) if base and os.path.isabs(base) else Path.home() / ".cache"
+    return root / "big-o-tracker"
+
+
+# Results persist across editor sessions, one JSON file per distinct source,
+# unless BIG_O_TRACKER_NO_CACHE is set to anything but "" or "0"
+CACHE_DIR = _cache_dir()
+_DISK_CACHE_ENABLED = os.environ.get("BIG_O_TRACKER_NO_CACHE", "") in ("", "0")
+# Most files kept in CACHE_DIR; the oldest writes are removed beyond this, which
+# also clears entries orphaned by a version bump and stray temporary files
+_DISK_CACHE_SIZE = 512
+# Bump when analysis rules change so stale entries are never read back
+_CACHE_VERSION = b"3"
+
+# In-process LRU of recent results keyed on the source digest, so cached entries
+# don't keep whole source buffers alive
+_RESULT_CACHE: "OrderedDict[str, Tuple[FunctionAnalysis, ...]]" = OrderedDict()
+_RESULT_CACHE_SIZE = 256
+# FunctionAnalysis field names, read straight off the slots when persisting;
+# asdict() would deep-copy every (already immutable) value
+_RESULT_FIELDS = tuple(f.name for f in fields(FunctionAnalysis))
+
+# Argument names that suggest a recursive call works on half of the input
+_DIV_NAMES = frozenset({'mid', 'left', 'right'})
+# Stack-style mutations that signal backtracking
+_APPEND_POP = frozenset({'append', 'pop'})
+
+# Snippets shorter than _TRIVIAL_LEN with none of these substrings have no calls,
+# loops, comprehensions, subscripts or membership tests. They still get parsed:
+# operators, comparisons, unpacking, f-strings and generators can all be linear
+# in their operands (a + b on lists, a == b, {**d}, yield from), so only a tree
+# with none of _NONTRIVIAL_NODES gets _TRIVIAL_RESULT without an LLM call
+_TRIVIAL_LEN = 64
+_NONTRIVIAL = ("(", "[", "for", "while", " in ")
+_NONTRIVIAL_NODES = frozenset({
+    ast.BinOp, ast.AugAssign, ast.Compare, ast.Starred, ast.JoinedStr,
+    ast.Yield, ast.YieldFrom, ast.Await,
+})
+_TRIVIAL_RESULT = FunctionAnalysis("<main>", O_1, O_1, 0, 0)
+
+# PatternDetector._flags bits, one per pattern seen anywhere in the source
+_F_LOOP = 1 << 0
+_F_SQRT_LOOP = 1 << 1           # loop bounded by sqrt(n) / n ** 0.5
+_F_DIV_REC = 1 << 2             # recursive call on a halved argument
+_F_DIV_REC_IN_LOOP = 1 << 3     # ... made inside a loop
+_F_BACKTRACK = 1 << 4
+_F_APPEND_POP = 1 << 5
+_F_SORT = 1 << 6
+_F_WHILE_MID = 1 << 7           # while loop assigning mid
+
+def _parse(code: str) -> Optional[ast.Module]:
+    """Parse code into an AST, or None if it is not valid Python."""
+    try:
+        # compile() directly: ast.parse is a wrapper that re-derives these flags per call
+        return cast(ast.Module, compile(code, "<analyze>", "exec", ast.PyCF_ONLY_AST))
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        # Invalid syntax, null bytes, or nesting too deep for the parser
         return None
 
 
-class PatternDetector(ast.NodeVisitor):
+def _is_trivial(tree: ast.Module) -> bool:
+    """True if nothing in tree can take time that grows with its operands."""
+    for node in ast.walk(tree):
+        if type(node) in _NONTRIVIAL_NODES:
+            return False
+        # {**d} unpacking shows up as a None key
+        if type(node) is ast.Dict and None in node.keys:
+            return False
+    return True
+
+
+# Pattern detection rules
+def detect_patterns_ast(code: str, tree: Optional[ast.Module] = None) -> Optional[Tuple[str, str, int, int]]:
+    """Detect common complexity patterns using simple AST rules. Returns (time, space, loops, recursions) or None if no pattern matches.
+    
+    tree is code already parsed by the caller; when omitted, code is parsed here.
+    """
+    if tree is None:
+        tree = _parse(code)
+        if tree is None:
+            return None
+    
+    # Parse failures are handled in _parse; the walk itself is iterative and does
+    # not raise on valid trees, so errors here are real bugs and propagate
+    
+    visitor = PatternDetector()
+    visitor.run(tree)
+    
+    # Check patterns in order of specificity
+    time_comp, space_comp, loops, recursions = visitor.get_result()
+    
+    # If we detected something, return it
+    if time_comp and time_comp != O_UNKNOWN:
+        return (time_comp, space_comp, loops, recursions)
+    
+    return None
+
+
+class PatternDetector:
     """Simple pattern detector for common complexity patterns."""
     
-    def __init__(self):
-        self.recursive_calls_in_same_path = 0
-        self.max_recursive_calls_same_path = 0
-        self.has_dividing_recursion = False
-        self.has_loop = False
-        self.has_sqrt_loop = False  # NEW: Track sqrt in loop bounds
-        self.has_dividing_recursion_with_loop = False
-        self.has_backtracking_pattern = False
-        self.has_append_pop = False
-        self.has_sort = False
-        self.has_while_with_mid = False
-        self.loops_count = 0
-        self.recursions_count = 0
-        self.current_function_name = None
-        self.in_loop = False
+    # Node type -> visit_* handler, filled in once the class is defined
+    _DISPATCH: ClassVar[Dict[type, Callable[..., Optional[Tuple[str, Any]]]]]
+    
+    def __init__(self) -> None:
+        self.max_recursive_calls_same_path: int = 0
+        # Pattern flags packed into one int (_F_* bits)
+        self._flags: int = 0
+        self.loops_count: int = 0
+        self.recursions_count: int = 0
+        # Per-function frame {"name", "recursive_calls"} for the innermost enclosing def;
+        # the enclosing function's frame is restored by the exit marker
+        self._frame: Optional[Dict[str, Any]] = None
+        self.in_loop: bool = False
+    
+    def run(self, node: ast.AST) -> None:
+        """Walk the subtree rooted at node once, with an explicit stack instead of recursion.
+        
+        Handlers run before their children (pre-order, as with generic_visit) and may
+        return an (attribute, value) pair that is restored once the subtree is done.
+        """
+        stack: List[Union[ast.AST, Tuple[str, Any]]] = [node]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, tuple):
+                # Exit marker: the subtree below it has been fully visited
+                setattr(self, item[0], item[1])
+                continue
+            
+            handler = self._DISPATCH.get(type(item))
+            if handler is not None:
+                restore = handler(self, item)
+                if restore is not None:
+                    stack.append(restore)
+            
+            push_children(stack, item)
         
-    def visit_FunctionDef(self, node):
-        old_name = self.current_function_name
-        self.current_function_name = node.name
-        self.recursive_calls_in_same_path = 0
-        self.generic_visit(node)
-        self.current_function_name = old_name
-    
-    def visit_For(self, node):
-        self.has_loop = True
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> Tuple[str, Optional[Dict[str, Any]]]:
+        old_frame = self._frame
+        self._frame = {"name": node.name, "recursive_calls": 0}
+        return ("_frame", old_frame)
+    
+    # async def bodies are analyzed exactly like plain functions
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_For(self, node: ast.For) -> Tuple[str, bool]:
+        self._flags |= _F_LOOP
         self.loops_count += 1
         
         # Check for sqrt pattern in range: range(2, int(n**0.5) + 1) or range(2, int(sqrt(n)))
@@ -59,38 +171,36 @@ class PatternDetector(ast.NodeVisitor):
                 # Check range arguments for sqrt
                 for arg in node.iter.args:
                     if self._has_sqrt_pattern(arg):
-                        self.has_sqrt_loop = True
+                        self._flags |= _F_SQRT_LOOP
         
         old_in_loop = self.in_loop
         self.in_loop = True
-        self.generic_visit(node)
-        self.in_loop = old_in_loop
+        return ("in_loop", old_in_loop)
     
-    def _has_sqrt_pattern(self, node):
+    def _has_sqrt_pattern(self, node: ast.expr) -> bool:
         """Check if node contains sqrt or **0.5 pattern"""
-        if isinstance(node, ast.BinOp):
-            # Check for n**0.5
-            if isinstance(node.op, ast.Pow):
-                if isinstance(node.right, ast.Constant) and node.right.value == 0.5:
+        # Explicit worklist over the operands and call arguments the pattern can sit in
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if type(node) is ast.BinOp:
+                # Check for n**0.5
+                if (type(node.op) is ast.Pow and type(node.right) is ast.Constant
+                        and node.right.value == 0.5):
                     return True
-            # Recursively check operands
-            return self._has_sqrt_pattern(node.left) or self._has_sqrt_pattern(node.right)
-        elif isinstance(node, ast.Call):
-            # Check for sqrt() or int(sqrt()) or int(n**0.5)
-            if isinstance(node.func, ast.Name) and node.func.id in ['sqrt', 'int']:
-                for arg in node.args:
-                    if self._has_sqrt_pattern(arg):
-                        return True
-            # Check for math.sqrt()
-            if isinstance(node.func, ast.Attribute) and node.func.attr == 'sqrt':
-                return True
-            return any(self._has_sqrt_pattern(arg) for arg in node.args)
-        elif isinstance(node, ast.UnaryOp):
-            return self._has_sqrt_pattern(node.operand)
+                stack.append(node.right)
+                stack.append(node.left)
+            elif type(node) is ast.Call:
+                # Check for math.sqrt(); sqrt(...) / int(...) are searched through their arguments
+                if type(node.func) is ast.Attribute and node.func.attr == 'sqrt':
+                    return True
+                stack.extend(node.args)
+            elif type(node) is ast.UnaryOp:
+                stack.append(node.operand)
         return False
     
-    def visit_While(self, node):
-        self.has_loop = True
+    def visit_While(self, node: ast.While) -> Tuple[str, bool]:
+        self._flags |= _F_LOOP
         self.loops_count += 1
         old_in_loop = self.in_loop
         self.in_loop = True
@@ -105,128 +215,127 @@ class PatternDetector(ast.NodeVisitor):
                         break
         
         if has_mid:
-            self.has_while_with_mid = True
+            self._flags |= _F_WHILE_MID
         
-        self.generic_visit(node)
-        self.in_loop = old_in_loop
+        return ("in_loop", old_in_loop)
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        # Each callee shape has its own helper
+        func = node.func
+        if type(func) is ast.Name:
+            self._visit_call_name(func, node)
+        elif type(func) is ast.Attribute:
+            self._visit_call_attr(func, node)
     
-    def visit_Call(self, node):
+    def _visit_call_name(self, func: ast.Name, node: ast.Call) -> None:
+        # Check for recursion: f(...)
+        frame = self._frame
+        if frame is not None and func.id == frame["name"]:
+            self._record_recursive_call(node, frame)
+    
+    def _visit_call_attr(self, func: ast.Attribute, node: ast.Call) -> None:
+        attr = func.attr
         # Check for .sort()
-        if isinstance(node.func, ast.Attribute) and node.func.attr == 'sort':
-            self.has_sort = True
-        
-        # Check for recursion
-        if self.current_function_name:
-            is_recursive = False
-            if isinstance(node.func, ast.Name) and node.func.id == self.current_function_name:
-                is_recursive = True
-            elif isinstance(node.func, ast.Attribute):
-                if isinstance(node.func.value, ast.Name) and node.func.value.id == "self":
-                    if node.func.attr == self.current_function_name:
-                        is_recursive = True
-            
-            if is_recursive:
-                self.recursions_count += 1
-                self.recursive_calls_in_same_path += 1
-                self.max_recursive_calls_same_path = max(
-                    self.max_recursive_calls_same_path,
-                    self.recursive_calls_in_same_path
-                )
-                
-                # Check if dividing (n/2, n//2, etc.)
-                for arg in node.args:
-                    if isinstance(arg, ast.BinOp):
-                        if isinstance(arg.op, (ast.FloorDiv, ast.Div)):
-                            self.has_dividing_recursion = True
-                            if self.in_loop:
-                                self.has_dividing_recursion_with_loop = True
-                    elif isinstance(arg, ast.Name):
-                        if arg.id in ['mid', 'left', 'right']:
-                            self.has_dividing_recursion = True
-        
-        # Check for append/pop (backtracking pattern)
-        if isinstance(node.func, ast.Attribute):
-            if node.func.attr in ['append', 'pop']:
-                self.has_append_pop = True
-                self.has_backtracking_pattern = True
+        if attr == 'sort':
+            self._flags |= _F_SORT
+        # Check for append/pop (backtracking pattern), including x = stack.pop():
+        # an assignment's value is walked too, so it reaches this handler
+        elif attr in _APPEND_POP:
+            self._flags |= _F_APPEND_POP | _F_BACKTRACK
         
-        self.generic_visit(node)
-    
-    def visit_Assign(self, node):
-        # Check for append/pop assignments
-        if isinstance(node.value, ast.Call):
-            if isinstance(node.value.func, ast.Attribute):
-                if node.value.func.attr in ['append', 'pop']:
-                    self.has_append_pop = True
-                    self.has_backtracking_pattern = True
+        # Check for recursion: self.f(...)
+        frame = self._frame
+        if (frame is not None and attr == frame["name"]
+                and type(func.value) is ast.Name and func.value.id == "self"):
+            self._record_recursive_call(node, frame)
+    
+    def _record_recursive_call(self, node: ast.Call, frame: Dict[str, Any]) -> None:
+        self.recursions_count += 1
+        frame["recursive_calls"] += 1
+        self.max_recursive_calls_same_path = max(
+            self.max_recursive_calls_same_path,
+            frame["recursive_calls"]
+        )
         
-        self.generic_visit(node)
+        # Check if dividing (n/2, n//2, etc.)
+        for arg in node.args:
+            if type(arg) is ast.BinOp:
+                if type(arg.op) in DIV_OPS:
+                    self._flags |= _F_DIV_REC
+                    if self.in_loop:
+                        self._flags |= _F_DIV_REC_IN_LOOP
+            elif type(arg) is ast.Name:
+                if arg.id in _DIV_NAMES:
+                    self._flags |= _F_DIV_REC
     
     def get_result(self) -> Tuple[str, str, int, int]:
         """Apply pattern rules to get complexity."""
-        time_comp = "O(?)"
-        space_comp = "O(1)"
+        flags = self._flags
+        time_comp = O_UNKNOWN
+        space_comp = O_1
         
         # Rule 1: sort() -> O(n log n)
-        if self.has_sort:
-            time_comp = "O(n log n)"
-            space_comp = "O(1)"
+        if flags & _F_SORT:
+            time_comp = O_N_LOG_N
+            space_comp = O_1
         
         # Rule 2: while + mid -> O(log n)
-        elif self.has_while_with_mid:
-            time_comp = "O(log n)"
-            space_comp = "O(1)"
+        elif flags & _F_WHILE_MID:
+            time_comp = O_LOG_N
+            space_comp = O_1
         
         # Rule 3: 2+ recursive calls in same path, no divide -> O(2^n)
-        elif self.max_recursive_calls_same_path >= 2 and not self.has_dividing_recursion:
-            time_comp = "O(2^n)"
-            space_comp = "O(n)"
+        elif self.max_recursive_calls_same_path >= 2 and not flags & _F_DIV_REC:
+            time_comp = O_2_N
+            space_comp = O_N
         
         # Rule 4: backtracking + append/pop -> O(2^n)
-        elif self.has_backtracking_pattern and self.has_append_pop:
-            time_comp = "O(2^n)"
-            space_comp = "O(n)"
+        elif flags & _F_BACKTRACK and flags & _F_APPEND_POP:
+            time_comp = O_2_N
+            space_comp = O_N
         
         # Rule 5: recursion divides and single path -> O(log n)
-        elif self.has_dividing_recursion and self.max_recursive_calls_same_path <= 1:
-            time_comp = "O(log n)"
-            space_comp = "O(log n)"
+        elif flags & _F_DIV_REC and self.max_recursive_calls_same_path <= 1:
+            time_comp = O_LOG_N
+            space_comp = O_LOG_N
         
         # Rule 6: loop + dividing recursion -> O(n log n)
-        elif self.has_dividing_recursion_with_loop or (self.has_loop and self.has_dividing_recursion):
-            time_comp = "O(n log n)"
-            space_comp = "O(log n)"
+        elif flags & _F_DIV_REC_IN_LOOP or (flags & _F_LOOP and flags & _F_DIV_REC):
+            time_comp = O_N_LOG_N
+            space_comp = O_LOG_N
         
         # Rule 6.5: loop with sqrt bounds -> O(√n) or O(sqrt(n))
-        elif self.has_sqrt_loop and self.recursions_count == 0:
-            time_comp = "O(sqrt(n))"
-            space_comp = "O(1)"
+        elif flags & _F_SQRT_LOOP and self.recursions_count == 0:
+            time_comp = O_SQRT_N
+            space_comp = O_1
         
         # Rule 7: simple loop -> O(n)
-        elif self.has_loop and self.recursions_count == 0:
-            time_comp = "O(n)"
-            space_comp = "O(1)"
+        elif flags & _F_LOOP and self.recursions_count == 0:
+            time_comp = O_N
+            space_comp = O_1
         
         # Rule 8: simple recursion -> O(n)
-        elif self.recursions_count > 0 and not self.has_dividing_recursion:
-            time_comp = "O(n)"
-            space_comp = "O(n)"
+        elif self.recursions_count > 0 and not flags & _F_DIV_REC:
+            time_comp = O_N
+            space_comp = O_N
         
         return (time_comp, space_comp, self.loops_count, self.recursions_count)
 
 
+# Built once at import: dispatch in run() is a single dict lookup per node
+PatternDetector._DISPATCH = build_dispatch(PatternDetector)
+
+
 def get_complexity_from_llm(code: str) -> Optional[Tuple[str, str, int, int]]:
     """Use LLM (Groq API) to analyze code when patterns don't match."""
-    import os
-    
     # Get API key from environment variable
-   
+    api_key = os.environ.get("GROQ_API_KEY")
     if not api_key:
         # No API key - return None to fallback to AST
         return None
     
     try:
-        from groq import Groq
+        from groq import Groq  # type: ignore[import-not-found]
     except ImportError:
         # groq package not installed - return None to fallback to AST
         return None
@@ -262,6 +371,8 @@ SOURCE CODE:
 <<<CODE_END>>>"""
     
     try:
+        # Created inside the guard: constructor failures (e.g. a groq/httpx
+        # version mismatch) must fall back to AST like any other API error
         client = Groq(api_key=api_key)
         
         # Call Groq API with llama model (fast and accurate)
@@ -287,65 +398,178 @@ SOURCE CODE:
         return None
 
 
+# Labels parse_llm_response recognises, keyed on their (distinct) first letter,
+# with the slot each one fills in the (time, space, loops, recursions) result
+_LLM_FIELDS = {
+    "t": ("time complexity", 0),
+    "s": ("space complexity", 1),
+    "l": ("loops", 2),
+    "r": ("recursions", 3),
+}
+
+
 def parse_llm_response(text: str) -> Tuple[str, str, int, int]:
     """Parse LLM response to extract complexity info."""
-    time_comp = "O(?)"
-    space_comp = "O(?)"
-    loops = 0
-    recursions = 0
+    fields: List[Any] = [O_UNKNOWN, O_UNKNOWN, 0, 0]
     
-    lines = text.split("\n")
-    for line in lines:
+    for line in text.split("\n"):
         line = line.strip()
-        lower = line.lower()
+        entry = _LLM_FIELDS.get(line[:1].lower())
+        if entry is None:
+            continue
+        label, index = entry
+        # Lowercase just the label-length prefix, not the whole line
+        if line[:len(label)].lower() != label:
+            continue
         
-        if lower.startswith("time complexity"):
-            value = line.split(":", 1)[-1].strip()
-            if value and value.lower() != "none":
-                time_comp = value
-        elif lower.startswith("space complexity"):
-            value = line.split(":", 1)[-1].strip()
-            if value and value.lower() != "none":
-                space_comp = value
-        elif lower.startswith("loops"):
-            value = line.split(":", 1)[-1].strip()
-            if value and value.lower() != "none":
-                try:
-                    loops = int(value)
-                except:
-                    loops = 0
-        elif lower.startswith("recursions"):
-            value = line.split(":", 1)[-1].strip()
-            if value and value.lower() != "none":
-                try:
-                    recursions = int(value)
-                except:
-                    recursions = 0
-    
-    return (time_comp, space_comp, loops, recursions)
+        _, sep, value = line.partition(":")
+        value = (value if sep else line).strip()
+        if not value or value.lower() == "none":
+            continue
+        
+        if index < 2:
+            # Interned like the rule results, so repeated answers share one string
+            fields[index] = sys.intern(value)
+        else:
+            # Optional sign then decimal digits; anything else counts as 0.
+            # Checked up front so malformed counts never raise
+            digits = value[1:] if value[0] in "+-" else value
+            fields[index] = int(value) if digits.isdecimal() else 0
+    
+    return (fields[0], fields[1], fields[2], fields[3])
 
 
 def analyze_source(source: str) -> List[FunctionAnalysis]:
     """Analyze source code: try pattern detection first, fallback to LLM if no pattern matches."""
+    if len(source) < _TRIVIAL_LEN and not any(k in source for k in _NONTRIVIAL):
+        # Unparseable snippets take the usual path (LLM, else O(?))
+        tree = _parse(source)
+        if tree is not None and _is_trivial(tree):
+            return [_TRIVIAL_RESULT]
+    
+    key = _source_key(source)
+    results = _RESULT_CACHE.get(key)
+    if results is not None:
+        _RESULT_CACHE.move_to_end(key)
+        return list(results)
+    
+    results = _parse_and_analyze(source, key)
+    _RESULT_CACHE[key] = results
+    if len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+        _RESULT_CACHE.popitem(last=False)
+    return list(results)
+
+
+def analyze_sources(sources: List[str]) -> List[List[FunctionAnalysis]]:
+    """Analyze independent sources in parallel, one worker process per core. Results keep input order."""
+    if len(sources) <= 1:
+        # Not worth the process start-up cost
+        return [analyze_source(source) for source in sources]
+    
+    # Imported here: multiprocessing is slow to load, and the CLI never needs it
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(analyze_source, sources, chunksize=8))
+
+
+def _source_key(source: str) -> str:
+    """Digest identifying source in both the in-process and the on-disk cache."""
+    return hashlib.blake2b(source.encode("utf-8", "surrogatepass"), key=_CACHE_VERSION, digest_size=20).hexdigest()
+
+
+def _load_cached(path: Path) -> Optional[Tuple[FunctionAnalysis, ...]]:
+    try:
+        return tuple(FunctionAnalysis(**d) for d in json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError, TypeError):
+        # Missing, unreadable or corrupt entry - recompute
+        return None
+
+
+def _store_cached(path: Path, results: Tuple[FunctionAnalysis, ...]) -> None:
+    # Imported here: only cache misses write, and the import costs every start
+    import tempfile
+    
+    rows = [{name: getattr(r, name) for name in _RESULT_FIELDS} for r in results]
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file and renamed into place, so a concurrent
+        # run (one per editor debounce) never reads a half-written entry
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(rows, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        _prune_cache(path.parent)
+    except OSError:
+        # Cache is best-effort; a read-only home must not break analysis
+        pass
+
+
+def _prune_cache(directory: Path) -> None:
+    """Delete the oldest files in directory beyond _DISK_CACHE_SIZE."""
+    with os.scandir(directory) as it:
+        entries = [entry for entry in it if entry.is_file(follow_symlinks=False)]
+    if len(entries) <= _DISK_CACHE_SIZE:
+        return
+    
+    def mtime(entry: os.DirEntry) -> float:
+        try:
+            return entry.stat(follow_symlinks=False).st_mtime
+        except OSError:
+            # Removed since the scan; sorts first and its unlink is skipped below
+            return 0.0
+    
+    entries.sort(key=mtime)
+    for entry in entries[:len(entries) - _DISK_CACHE_SIZE]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            # A concurrent run got there first
+            pass
+
+
+def _parse_and_analyze(source: str, key: str) -> Tuple[FunctionAnalysis, ...]:
+    """Body of analyze_source behind the in-process cache; consults the disk cache first."""
+    path = CACHE_DIR / f"{key}.json"
+    if _DISK_CACHE_ENABLED:
+        cached = _load_cached(path)
+        if cached is not None:
+            return cached
+    
+    # Parse once; the tree is shared with the pattern detector.
+    # Unparseable source still goes to the LLM, which may cope with fragments
+    tree = _parse(source)
+    
     # Try pattern detection first
-    result = detect_patterns_ast(source)
+    result = detect_patterns_ast(source, tree) if tree is not None else None
     
     if result is None:
         # No pattern matched - use LLM
         result = get_complexity_from_llm(source)
     
     if result is None:
-        # Both failed - return defaults
-        result = ("O(?)", "O(?)", 0, 0)
+        # Both failed - return defaults, not persisted so a later run
+        # (e.g. once an API key is configured) gets another chance
+        result = (O_UNKNOWN, O_UNKNOWN, 0, 0)
+        persist = False
+    else:
+        persist = True
     
     time_comp, space_comp, loops, recursions = result
     
-    return [
+    results = (
         FunctionAnalysis(
             name="<main>",
             time_complexity=time_comp,
             space_complexity=space_comp,
             max_loop_depth=loops,
             recursive_calls=recursions,
-        )
-    ]
\ No newline at end of file
+        ),
+    )
+    if persist and _DISK_CACHE_ENABLED:
+        _store_cached(path, results)
+    return results
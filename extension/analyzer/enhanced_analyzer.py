@@ -1,15 +1,90 @@
 
 import ast
-from typing import Dict, List, Optional, Set, Tuple
+import sys
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Set, Tuple, Union
+from ._scan import DIV_OPS, build_dispatch, child_nodes
 from .symbolic import (
     SymbolicComplexity, ComplexityType, RecurrenceSolver,
-    DataStructureCosts, infer_input_size
+    DataStructureCosts, get_operation_cost, infer_input_size
 )
 
+# Binary search / halving-loop shapes
+_BS_LEFT_NAMES = frozenset({'l', 'left', 'low'})
+_BS_RIGHT_NAMES = frozenset({'r', 'right', 'high'})
+
+# Backtracking shapes: attributes that mutate shared state, undo it, or copy it
+_MUTATOR_ATTRS = frozenset({'append', 'pop', 'add', 'remove'})
+_UNDO_ATTRS = frozenset({'pop', 'remove'})
+_COPY_ATTRS = frozenset({'copy', '__getitem__'})
+
+# Names with an entry in DataStructureCosts; anything else cannot have a cost
+_KNOWN_ATTRS = DataStructureCosts.KNOWN_ATTRS
+_KNOWN_BUILTINS = DataStructureCosts.KNOWN_BUILTINS
+
+# Shared instances of the fixed complexities built below, so the identity
+# short-circuits in SymbolicComplexity's combinators apply
+_CONST = SymbolicComplexity.intern(ComplexityType.CONSTANT)
+_LOGN = SymbolicComplexity.intern(ComplexityType.LOGARITHMIC)
+_LINEAR = SymbolicComplexity.intern(ComplexityType.LINEAR)
+_NLOGN = SymbolicComplexity.intern(ComplexityType.LINEARITHMIC)
+_FACT = SymbolicComplexity.intern(ComplexityType.FACTORIAL)
+
+# Pattern bits returned by _scan_while_body
+_BS_MID = 1      # mid = ... // ...
+_BS_LEFT = 2     # l = mid + ...
+_BS_RIGHT = 4    # r = mid - ...
+_HALVING = 8     # n //= k directly in the loop body
+
+# What a visit_* handler returns: nodes to walk and (attribute, value) exit markers
+_Todo = Sequence[Union[ast.AST, Tuple[str, Any]]]
+
+
+def _scan_while_body(body: List[ast.stmt]) -> int:
+    """Scan a while body once, descending only into if/else branches, and
+    return the _BS_* / _HALVING bits for the patterns found"""
+    flags = 0
+    stack = [(body, True)]
+    while stack:
+        stmts, top_level = stack.pop()
+        for stmt in stmts:
+            if type(stmt) is ast.Assign:
+                value = stmt.value
+                if type(value) is not ast.BinOp:
+                    continue
+                op_type = type(value.op)
+                for target in stmt.targets:
+                    if type(target) is ast.Name:
+                        if target.id == 'mid':
+                            if op_type is ast.FloorDiv:
+                                flags |= _BS_MID
+                        elif target.id in _BS_LEFT_NAMES:
+                            # Check if it's mid + something
+                            if (op_type is ast.Add and
+                                    type(value.left) is ast.Name and value.left.id == 'mid'):
+                                flags |= _BS_LEFT
+                        elif target.id in _BS_RIGHT_NAMES:
+                            # Check if it's mid - something
+                            if (op_type is ast.Sub and
+                                    type(value.left) is ast.Name and value.left.id == 'mid'):
+                                flags |= _BS_RIGHT
+            elif type(stmt) is ast.If:
+                # Check if/else branches
+                stack.append((stmt.body, False))
+                if stmt.orelse:
+                    stack.append((stmt.orelse, False))
+            elif type(stmt) is ast.AugAssign:
+                # n //= k only counts directly in the loop body
+                if top_level and type(stmt.op) in DIV_OPS:
+                    flags |= _HALVING
+    return flags
+
 
 class LoopInfo:
+    # One instance per loop; slots keep them small and attribute access direct
+    __slots__ = ('bound_var', 'bound_type', 'is_nested', 'inner_complexity')
+    
     def __init__(self):
-        self.bound_var: Optional[str]
+        self.bound_var: Optional[str] = None
         self.bound_type: Optional[str] = None  
         self.is_nested: bool = False
         self.inner_complexity: Optional[SymbolicComplexity] = None
@@ -17,6 +92,9 @@ class LoopInfo:
 
 class RecursionInfo:
     """Information about recursion"""
+    __slots__ = ('branching_factor', 'problem_reduction', 'recurrence_type',
+                 'has_backtracking_pattern', 'work_per_level')
+    
     def __init__(self):
         self.branching_factor: int = 0  
         self.problem_reduction: Optional[str] = None  
@@ -25,11 +103,61 @@ class RecursionInfo:
         self.work_per_level: Optional[SymbolicComplexity] = None
 
 
-class EnhancedCodeVisitor(ast.NodeVisitor):
+def _len_bound(call: ast.Call) -> Optional[str]:
+    """Bound of len(...): "m" for len(matrix[0]) (another dimension), "n" for
+    len(arr), None if call is not len with an argument"""
+    func = call.func
+    if type(func) is ast.Name and func.id == 'len' and call.args:
+        return "m" if type(call.args[0]) is ast.Subscript else "n"
+    return None
+
+
+def _bound_name(arg: ast.Name, loop_info: LoopInfo) -> None:
+    loop_info.bound_var = arg.id
+    loop_info.bound_type = "n"
+
+
+def _bound_constant(arg: ast.Constant, loop_info: LoopInfo) -> None:
+    loop_info.bound_type = "constant"
+
+
+def _bound_call(arg: ast.Call, loop_info: LoopInfo) -> None:
+    # len(arr) or len(matrix[0]); any other call is assumed linear
+    bound = _len_bound(arg) or "n"
+    loop_info.bound_type = bound
+    if bound == "m":
+        loop_info.bound_var = "m"
+
+
+def _bound_default(arg: ast.expr, loop_info: LoopInfo) -> None:
+    loop_info.bound_type = "n"
+
+
+# Bound of range(x) by the node type of x, anything else defaulting to "n"
+_RANGE_BOUND: Dict[type, Callable[[Any, LoopInfo], None]] = {
+    ast.Name: _bound_name,
+    ast.Constant: _bound_constant,
+    ast.Call: _bound_call,
+}
+
+
+class EnhancedCodeVisitor:
     """Enhanced visitor that collects detailed complexity information"""
     
-    def __init__(self, func_name: str = None):
-        self.func_name = func_name
+    # Node type -> visit_* handler, filled in once the class is defined
+    _DISPATCH: ClassVar[Dict[type, Callable[..., Optional[_Todo]]]]
+    
+    def __init__(self, func_name: Optional[str] = None):
+        # Child visitor reused for every nested def (see visit_FunctionDef)
+        self._nested_visitor: Optional["EnhancedCodeVisitor"] = None
+        self.reset(func_name)
+    
+    def reset(self, func_name: Optional[str] = None) -> None:
+        """Clear all collected state so the instance can analyze another function"""
+        self.func_name = sys.intern(func_name) if func_name else func_name
+        # Unqualified name ("Outer.inner" -> "inner") compared against call sites;
+        # interned so the equality check against AST identifiers is a pointer compare
+        self._func_name_base = sys.intern(func_name.rpartition('.')[2]) if func_name else None
         
         # Input size tracking
         self.input_vars: Dict[str, str] = {}  # param_name -> symbolic_var
@@ -41,11 +169,11 @@ class EnhancedCodeVisitor(ast.NodeVisitor):
         
         # Recursion analysis
         self.recursion_info = RecursionInfo()
-        self.recursive_calls: List[ast.Call] = []
         self.in_recursive_function = False
         
-        # Operation costs
-        self.operation_costs: List[SymbolicComplexity] = []
+        # Operation costs: only the most expensive one so far matters, since
+        # sequential operations add up to their maximum
+        self._max_op_cost: SymbolicComplexity = _CONST
         
         # Space complexity
         self.auxiliary_space: List[SymbolicComplexity] = []
@@ -61,17 +189,66 @@ class EnhancedCodeVisitor(ast.NodeVisitor):
         
         # Binary search pattern detection
         self.has_binary_search_pattern = False
+        
+        # Rendered complexities memoized by time_str() / space_str()
+        self._time_str: Optional[str] = None
+        self._space_str: Optional[str] = None
+    
+    def visit(self, node: ast.AST) -> None:
+        """Walk the subtree rooted at node with an explicit stack instead of recursion.
+        
+        Handlers are found through the node type -> handler table built for the
+        class and run before their children. They return the work that follows,
+        in order: nodes to walk and (attribute, value) exit markers that are
+        restored once the nodes before them are done. None walks all children.
+        """
+        # New facts invalidate any complexity rendered from the old ones
+        self._time_str = self._space_str = None
+        
+        dispatch = self._DISPATCH
+        stack: List[Union[ast.AST, Tuple[str, Any]]] = [node]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, tuple):
+                # Exit marker: everything queued before it has been visited
+                setattr(self, item[0], item[1])
+                continue
+            
+            handler = dispatch.get(type(item))
+            todo = handler(self, item) if handler is not None else None
+            if todo is None:
+                todo = child_nodes(item)
+            # Push in reverse so items pop in the order the handler listed them
+            stack.extend(reversed(todo))
+    
+    def time_str(self) -> str:
+        """Big-O time complexity of everything visited so far, rendered once"""
+        text = self._time_str
+        if text is None:
+            text = self._time_str = str(compute_time_complexity(self))
+        return text
     
-    def visit_FunctionDef(self, node):
+    def space_str(self) -> str:
+        """Big-O space complexity of everything visited so far, rendered once"""
+        text = self._space_str
+        if text is None:
+            text = self._space_str = str(compute_space_complexity(self))
+        return text
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> _Todo:
         """Analyze function parameters for input size inference"""
         # Check if this is a nested function
-        func_name_base = self.func_name.split('.')[-1] if self.func_name and '.' in self.func_name else (self.func_name if self.func_name else None)
-        is_nested = self.func_name and node.name != func_name_base
+        is_nested = self.func_name and node.name != self._func_name_base
         
         if is_nested:
             # Analyze nested function separately
             nested_name = f"{self.func_name}.{node.name}" if self.func_name else node.name
-            nested_visitor = EnhancedCodeVisitor(nested_name)
+            # Results are read back right away, so one child instance serves every nested def
+            nested_visitor = self._nested_visitor
+            if nested_visitor is None:
+                nested_visitor = self._nested_visitor = EnhancedCodeVisitor(nested_name)
+            else:
+                nested_visitor.reset(nested_name)
             nested_visitor.visit(node)
             
             # Propagate nested function's characteristics
@@ -88,7 +265,7 @@ class EnhancedCodeVisitor(ast.NodeVisitor):
             if nested_visitor.has_undo_operations:
                 self.has_undo_operations = True
             # Don't visit nested function body again
-            return
+            return ()
         
         # Infer input sizes from parameters
         for arg in node.args.args:
@@ -97,8 +274,8 @@ class EnhancedCodeVisitor(ast.NodeVisitor):
             symbolic_var = infer_input_size(param_name)
             self.input_vars[param_name] = symbolic_var
         
-        self.in_recursive_function = (self.func_name and 
-                                     node.name == self.func_name.split('.')[-1])
+        self.in_recursive_function = bool(self.func_name and
+                                          node.name == self._func_name_base)
         
         # Don't reset recursion_info - we want to track it for this function
         # Only save/restore if we're in a nested context
@@ -110,78 +287,54 @@ class EnhancedCodeVisitor(ast.NodeVisitor):
         self.has_mutable_state = False
         self.has_undo_operations = False
         
-        self.generic_visit(node)
-        
         # Don't restore loops - we want to keep them for complexity calculation
-        # Only restore mutable state (for parent context)
-        self.has_mutable_state = prev_mutable
-        self.has_undo_operations = prev_undo
+        # Only restore mutable state (for parent context) once the body is done
+        return child_nodes(node) + [
+            ("has_mutable_state", prev_mutable),
+            ("has_undo_operations", prev_undo),
+        ]
     
-    def visit_For(self, node):
+    # async def bodies are analyzed exactly like plain functions
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_For(self, node: ast.For) -> _Todo:
         """Analyze for loop bounds"""
         loop_info = LoopInfo()
         self.current_loop_depth += 1
         loop_info.is_nested = (self.current_loop_depth > 1)
         
         # Analyze loop bound
-        if isinstance(node.iter, ast.Call):
-            if isinstance(node.iter.func, ast.Name) and node.iter.func.id == 'range':
+        it = node.iter
+        if type(it) is ast.Call:
+            if type(it.func) is ast.Name and it.func.id == 'range':
+                args = it.args
                 # range(n) → O(n)
-                if len(node.iter.args) == 1:
-                    arg = node.iter.args[0]
-                    if isinstance(arg, ast.Name):
-                        loop_info.bound_var = arg.id
-                        loop_info.bound_type = "n"
-                    elif isinstance(arg, ast.Constant):
-                        loop_info.bound_type = "constant"
-                    elif isinstance(arg, ast.Call):
-                        # len(arr) or len(matrix[0])
-                        if isinstance(arg.func, ast.Name) and arg.func.id == 'len':
-                            if arg.args:
-                                # Check if it's len(matrix[0]) - different dimension
-                                if isinstance(arg.args[0], ast.Subscript):
-                                    # len(matrix[0]) - this is 'm' dimension
-                                    loop_info.bound_type = "m"
-                                    loop_info.bound_var = "m"
-                                else:
-                                    loop_info.bound_type = "n"
-                            else:
-                                loop_info.bound_type = "n"
-                        else:
-                            loop_info.bound_type = "n"  # Default
-                    else:
-                        loop_info.bound_type = "n"  # Default
+                if len(args) == 1:
+                    arg = args[0]
+                    _RANGE_BOUND.get(type(arg), _bound_default)(arg, loop_info)
                 # range(i, n) → O(n)
-                elif len(node.iter.args) == 2:
+                elif len(args) == 2:
                     # Check second arg for variable name
-                    second_arg = node.iter.args[1]
-                    if isinstance(second_arg, ast.Call):
-                        # len(arr) or len(matrix[0])
-                        if isinstance(second_arg.func, ast.Name) and second_arg.func.id == 'len':
-                            if second_arg.args:
-                                if isinstance(second_arg.args[0], ast.Subscript):
-                                    # len(matrix[0]) - different dimension
-                                    loop_info.bound_type = "m"  # Different variable
-                                else:
-                                    loop_info.bound_type = "n"
+                    second_arg = args[1]
+                    if type(second_arg) is ast.Call:
+                        # len(arr) or len(matrix[0]) - "m" is a different dimension
+                        loop_info.bound_type = _len_bound(second_arg)
                     else:
                         loop_info.bound_type = "n"
                 # range(0, n, step) → O(n/step) ≈ O(n)
-                elif len(node.iter.args) == 3:
+                elif len(args) == 3:
                     loop_info.bound_type = "n"
-        elif isinstance(node.iter, ast.Name):
+        elif type(it) is ast.Name:
             # for x in arr: - iterate over collection
             loop_info.bound_type = "n"
         
         self.loops.append(loop_info)
         prev_depth = self.current_loop_depth
         
-        self.generic_visit(node)
-        
-        self.current_loop_depth = prev_depth
         # Keep loop_info in list - don't remove it (needed for complexity calculation)
+        return child_nodes(node) + [("current_loop_depth", prev_depth)]
     
-    def visit_While(self, node):
+    def visit_While(self, node: ast.While) -> _Todo:
         """Analyze while loop - check for binary search pattern"""
         loop_info = LoopInfo()
         self.current_loop_depth += 1
@@ -189,199 +342,143 @@ class EnhancedCodeVisitor(ast.NodeVisitor):
         
         # Check for binary search pattern: while l <= r with mid calculation
         # Pattern: mid = (l + r) // 2, l = mid + 1, r = mid - 1
-        has_mid = False
-        has_left_update = False
-        has_right_update = False
-        
-        def check_binary_search_pattern(body):
-            """Recursively check for binary search pattern"""
-            nonlocal has_mid, has_left_update, has_right_update
-            for stmt in body:
-                if isinstance(stmt, ast.Assign):
-                    for target in stmt.targets:
-                        if isinstance(target, ast.Name):
-                            if target.id == 'mid':
-                                if isinstance(stmt.value, ast.BinOp):
-                                    if isinstance(stmt.value.op, ast.FloorDiv):
-                                        has_mid = True
-                            elif target.id in ['l', 'left', 'low']:
-                                if isinstance(stmt.value, ast.BinOp):
-                                    if isinstance(stmt.value.op, ast.Add):
-                                        # Check if it's mid + something
-                                        if (isinstance(stmt.value.left, ast.Name) and
-                                            stmt.value.left.id == 'mid'):
-                                            has_left_update = True
-                            elif target.id in ['r', 'right', 'high']:
-                                if isinstance(stmt.value, ast.BinOp):
-                                    if isinstance(stmt.value.op, ast.Sub):
-                                        # Check if it's mid - something
-                                        if (isinstance(stmt.value.left, ast.Name) and
-                                            stmt.value.left.id == 'mid'):
-                                            has_right_update = True
-                elif isinstance(stmt, ast.If):
-                    # Check if/else branches
-                    check_binary_search_pattern(stmt.body)
-                    if stmt.orelse:
-                        check_binary_search_pattern(stmt.orelse)
+        # and for the n //= k pattern, in one pass over the body
+        flags = _scan_while_body(node.body)
         
-        check_binary_search_pattern(node.body)
-        
-        if has_mid and (has_left_update or has_right_update):
+        if flags & _BS_MID and flags & (_BS_LEFT | _BS_RIGHT):
             loop_info.bound_type = "log n"  # Binary search
             self.has_binary_search_pattern = True
         
-        # Check for n //= k pattern
-        for stmt in node.body:
-            if isinstance(stmt, ast.AugAssign):
-                if isinstance(stmt.op, (ast.FloorDiv, ast.Div)):
-                    loop_info.bound_type = "log n"
+        if flags & _HALVING:
+            loop_info.bound_type = "log n"
         
         self.loops.append(loop_info)
         prev_depth = self.current_loop_depth
         
-        self.generic_visit(node)
-        
-        self.current_loop_depth = prev_depth
         # Keep loop_info in list - don't remove it (needed for complexity calculation)
+        return child_nodes(node) + [("current_loop_depth", prev_depth)]
     
-    def visit_Call(self, node):
+    def visit_Call(self, node: ast.Call) -> Optional[_Todo]:
         """Track function calls and data structure operations"""
-        # Check for data structure operations
-        if isinstance(node.func, ast.Attribute):
-            attr_name = node.func.attr
-            if isinstance(node.func.value, ast.Name):
-                obj_name = node.func.value.id
-                operation = f"{obj_name}.{attr_name}"
-                cost = DataStructureCosts.get_cost(operation)
+        # The callee's shape is tested once; each branch also decides whether
+        # this is a recursive call (f(...) or self.f(...)). _func_name_base is
+        # None outside a named function, which no identifier equals
+        func = node.func
+        if type(func) is ast.Attribute:
+            attr_name = func.attr
+            value = func.value
+            # Check for data structure operations
+            if attr_name in _KNOWN_ATTRS and type(value) is ast.Name:
+                operation = f"{value.id}.{attr_name}"
+                cost = get_operation_cost(operation)
                 if cost:
-                    self.operation_costs.append(cost)
+                    self._max_op_cost = self._max_op_cost.max(cost)
             
             # Check for .sort()
             if attr_name == 'sort':
-                self.operation_costs.append(
-                    SymbolicComplexity(ComplexityType.LINEARITHMIC)
-                )
-        
-        # Check for built-in functions
-        if isinstance(node.func, ast.Name):
-            cost = DataStructureCosts.get_cost(node.func.id)
-            if cost:
-                self.operation_costs.append(cost)
-        
-        # Track recursive calls - MUST check before generic_visit
-        if self.func_name:
-            func_name_base = self.func_name.split('.')[-1] if '.' in self.func_name else self.func_name
-            is_recursive = False
+                self._max_op_cost = self._max_op_cost.max(_NLOGN)
             
-            if isinstance(node.func, ast.Name):
-                if node.func.id == func_name_base:
-                    is_recursive = True
-            elif isinstance(node.func, ast.Attribute):
-                if (isinstance(node.func.value, ast.Name) and 
-                    node.func.value.id == "self"):
-                    method_name = func_name_base
-                    if node.func.attr == method_name:
-                        is_recursive = True
+            is_recursive = (attr_name == self._func_name_base
+                            and type(value) is ast.Name and value.id == "self")
+        elif type(func) is ast.Name:
+            name = func.id
+            # Check for built-in functions
+            if name in _KNOWN_BUILTINS:
+                cost = get_operation_cost(name)
+                if cost:
+                    self._max_op_cost = self._max_op_cost.max(cost)
             
-            if is_recursive:
-                self.recursive_calls.append(node)
-                self.recursion_info.branching_factor += 1
-                
-                # Analyze problem reduction from arguments
-                self._analyze_problem_reduction(node)
+            is_recursive = name == self._func_name_base
+        else:
+            is_recursive = False
         
-        # Continue visiting to find nested calls
-        self.generic_visit(node)
+        # Track recursive calls - MUST check before the children are walked
+        if is_recursive:
+            self.recursion_info.branching_factor += 1
+            
+            # Analyze problem reduction from arguments
+            self._analyze_problem_reduction(node)
         
-        self.generic_visit(node)
+        # Continue visiting to find nested calls
+        return None
     
-    def _analyze_problem_reduction(self, call_node: ast.Call):
+    def _analyze_problem_reduction(self, call_node: ast.Call) -> None:
         """Analyze how the problem size is reduced in recursive call"""
+        info = self.recursion_info
         for arg in call_node.args:
             # Check for n-1, n+1 patterns
-            if isinstance(arg, ast.BinOp):
-                if isinstance(arg.op, ast.Sub):
-                    if isinstance(arg.left, ast.Name):
-                        if isinstance(arg.right, ast.Constant) and arg.right.value == 1:
-                            self.recursion_info.problem_reduction = "n-1"
-                elif isinstance(arg.op, ast.Add):
-                    if isinstance(arg.left, ast.Name):
-                        if isinstance(arg.right, ast.Constant) and arg.right.value == 1:
-                            self.recursion_info.problem_reduction = "index+1"
-                elif isinstance(arg.op, (ast.FloorDiv, ast.Div)):
-                    if isinstance(arg.right, ast.Constant):
-                        if arg.right.value == 2:
-                            self.recursion_info.problem_reduction = "n/2"
+            if type(arg) is ast.BinOp:
+                op_type = type(arg.op)
+                right = arg.right
+                if op_type is ast.Sub:
+                    if type(arg.left) is ast.Name:
+                        if type(right) is ast.Constant and right.value == 1:
+                            info.problem_reduction = "n-1"
+                elif op_type is ast.Add:
+                    if type(arg.left) is ast.Name:
+                        if type(right) is ast.Constant and right.value == 1:
+                            info.problem_reduction = "index+1"
+                elif op_type in DIV_OPS:
+                    if type(right) is ast.Constant:
+                        if right.value == 2:
+                            info.problem_reduction = "n/2"
                         else:
-                            self.recursion_info.problem_reduction = f"n/{arg.right.value}"
+                            info.problem_reduction = f"n/{right.value!s}"
             
             # Check for array slicing (divide & conquer)
-            elif isinstance(arg, ast.Subscript):
-                self.recursion_info.problem_reduction = "n/2"  # Heuristic
-                self.recursion_info.recurrence_type = "divide_conquer"
+            elif type(arg) is ast.Subscript:
+                info.problem_reduction = "n/2"  # Heuristic
+                info.recurrence_type = "divide_conquer"
             
             # Check for list slicing with len() reduction
-            elif isinstance(arg, ast.Call):
+            elif type(arg) is ast.Call:
                 # len(remaining) or similar - problem size reduction
-                if isinstance(arg.func, ast.Name) and arg.func.id == 'len':
+                if type(arg.func) is ast.Name and arg.func.id == 'len':
                     # This suggests the problem size is being reduced
-                    if not self.recursion_info.problem_reduction:
-                        self.recursion_info.problem_reduction = "n-1"
-            
-            # Check for list slicing operations (remaining[:i] + remaining[i+1:])
-            elif isinstance(arg, ast.BinOp):
-                if isinstance(arg.op, ast.Add):
-                    # List concatenation with slices suggests permutation pattern
-                    if (isinstance(arg.left, ast.Subscript) or 
-                        isinstance(arg.right, ast.Subscript)):
-                        # This is likely a permutation backtracking pattern
-                        if not self.recursion_info.problem_reduction:
-                            self.recursion_info.problem_reduction = "n-1"
+                    if not info.problem_reduction:
+                        info.problem_reduction = "n-1"
     
-    def visit_If(self, node):
+    def visit_If(self, node: ast.If) -> _Todo:
         """Track conditional branches - take max complexity"""
         self.in_conditional = True
-        prev_branches = self.branch_complexities[:]
-        self.branch_complexities = []
+        # branch_complexities collects across all branches and is read once, by
+        # compute_time_complexity, so it is not swapped out per if
         
-        # Analyze if branch
-        for stmt in node.body:
-            self.visit(stmt)
-        
-        # Analyze elif/else branches
-        if node.orelse:
-            for stmt in node.orelse:
-                self.visit(stmt)
-        
-        self.in_conditional = False
-        self.branch_complexities = prev_branches
+        # Analyze if branch, then elif/else branches
+        return node.body + node.orelse + [("in_conditional", False)]
     
-    def visit_AugAssign(self, node):
+    def visit_AugAssign(self, node: ast.AugAssign) -> _Todo:
         """Track mutable state operations (for backtracking detection)"""
         if isinstance(node.target, ast.Attribute):
-            if node.target.attr in ['append', 'pop', 'add', 'remove']:
+            if node.target.attr in _MUTATOR_ATTRS:
                 self.has_mutable_state = True
-                if node.target.attr in ['pop', 'remove']:
+                if node.target.attr in _UNDO_ATTRS:
                     self.has_undo_operations = True
+        return ()
     
-    def visit_Assign(self, node):
+    def visit_Assign(self, node: ast.Assign) -> _Todo:
         """Track list operations in assignments"""
         for target in node.targets:
             if isinstance(target, ast.Attribute):
-                if target.attr in ['append', 'pop', 'add', 'remove']:
+                if target.attr in _MUTATOR_ATTRS:
                     self.has_mutable_state = True
-                    if target.attr in ['pop', 'remove']:
+                    if target.attr in _UNDO_ATTRS:
                         self.has_undo_operations = True
             # Check for list slicing/copying (backtracking pattern)
             if isinstance(node.value, ast.Call):
                 if isinstance(node.value.func, ast.Attribute):
-                    if node.value.func.attr in ['copy', '__getitem__']:
+                    if node.value.func.attr in _COPY_ATTRS:
                         self.has_mutable_state = True
             # Check for list concatenation (path + [x])
             if isinstance(node.value, ast.BinOp):
                 if isinstance(node.value.op, ast.Add):
                     if isinstance(node.value.left, ast.List) or isinstance(node.value.right, ast.List):
                         self.has_mutable_state = True
+        return ()
+
+
+# Built once at import: visit() is a single dict lookup per node
+EnhancedCodeVisitor._DISPATCH = build_dispatch(EnhancedCodeVisitor)
 
 
 def compute_time_complexity(visitor: EnhancedCodeVisitor) -> SymbolicComplexity:
@@ -389,20 +486,18 @@ def compute_time_complexity(visitor: EnhancedCodeVisitor) -> SymbolicComplexity:
     Compute time complexity from collected information.
     Follows the specification rules.
     """
-    complexity = SymbolicComplexity(ComplexityType.CONSTANT)
-    
-    # 1. Check for built-in operations first (highest priority for operations like sort)
-    for op_cost in visitor.operation_costs:
-        # For operations like sort(), they dominate
-        if op_cost.expr_type == ComplexityType.LINEARITHMIC:
-            return op_cost
-        complexity = complexity.add(op_cost)
+    # 1. Check for built-in operations first (highest priority for operations like sort).
+    # The visitor keeps the most expensive one seen, the sum of all of them
+    complexity = visitor._max_op_cost
+    # For operations like sort(), they dominate
+    if complexity.expr_type == ComplexityType.LINEARITHMIC:
+        return complexity
     
     # 1.5. Check for binary search pattern in while loops (before recursion/loops)
     # Binary search: while loop with mid = (l+r)//2, l = mid+1, r = mid-1
     if hasattr(visitor, 'has_binary_search_pattern') and visitor.has_binary_search_pattern:
         if visitor.recursion_info.branching_factor == 0:
-            return SymbolicComplexity(ComplexityType.LOGARITHMIC)
+            return _LOGN
     
     # 2. Handle recursion (highest priority for recursive algorithms)
     if visitor.recursion_info.branching_factor > 0:
@@ -423,7 +518,7 @@ def compute_time_complexity(visitor: EnhancedCodeVisitor) -> SymbolicComplexity:
                 # Permutations: loop iterates len(remaining) times, recursively calls with n-1
                 if has_loop_in_recursion:
                     # Permutations: T(n) = n * T(n-1) → O(n!)
-                    complexity = SymbolicComplexity(ComplexityType.FACTORIAL)
+                    complexity = _FACT
                 elif visitor.has_undo_operations:
                     # Subsets: T(n) = 2 * T(n-1) → O(2^n)
                     complexity = RecurrenceSolver.solve(
@@ -438,7 +533,7 @@ def compute_time_complexity(visitor: EnhancedCodeVisitor) -> SymbolicComplexity:
                 # Divide & conquer
                 if visitor.recursion_info.problem_reduction == "n/2":
                     recurrence_type = "divide_conquer"
-                    work = SymbolicComplexity(ComplexityType.LINEAR)
+                    work = _LINEAR
                     complexity = RecurrenceSolver.solve(
                         recurrence_type,
                         visitor.recursion_info.branching_factor,
@@ -457,7 +552,7 @@ def compute_time_complexity(visitor: EnhancedCodeVisitor) -> SymbolicComplexity:
             # Permutations pattern: for loop inside recursive function
             if has_loop_in_recursion and visitor.has_mutable_state:
                 # Permutations with loop: T(n) = n * T(n-1) → O(n!)
-                complexity = SymbolicComplexity(ComplexityType.FACTORIAL)
+                complexity = _FACT
             else:
                 # Single recursive call
                 complexity = RecurrenceSolver.solve(
@@ -480,54 +575,43 @@ def compute_time_complexity(visitor: EnhancedCodeVisitor) -> SymbolicComplexity:
     
     if not recursion_dominates:
         if visitor.loops:
-            # Separate nested and sequential loops
-            nested_loops = [l for l in visitor.loops if l.is_nested]
-            sequential_loops = [l for l in visitor.loops if not l.is_nested]
-            
-            # Sequential loops: O(max(f, g)) - worst case
-            seq_complexity = SymbolicComplexity(ComplexityType.CONSTANT)
-            for loop in sequential_loops:
-                if loop.bound_type == "n":
-                    seq_complexity = seq_complexity.max(
-                        SymbolicComplexity(ComplexityType.LINEAR)
-                    )
-                elif loop.bound_type == "log n":
-                    seq_complexity = seq_complexity.max(
-                        SymbolicComplexity(ComplexityType.LOGARITHMIC)
-                    )
-                elif loop.bound_type == "constant":
-                    pass  # O(1) doesn't affect max
-                else:
-                    seq_complexity = seq_complexity.max(
-                        SymbolicComplexity(ComplexityType.LINEAR)
-                    )
+            # One pass over the loops: whether any is nested, whether any runs
+            # over a second dimension, and the sequential loops' worst bound
+            has_nested = False
+            has_m = False
+            seq_type = ComplexityType.CONSTANT
+            for loop in visitor.loops:
+                bound_type = loop.bound_type
+                if bound_type == "m":
+                    has_m = True
+                if loop.is_nested:
+                    has_nested = True
+                # Sequential loops: O(max(f, g)) - worst case
+                elif bound_type == "log n":
+                    if seq_type is ComplexityType.CONSTANT:
+                        seq_type = ComplexityType.LOGARITHMIC
+                elif bound_type != "constant":
+                    # O(1) doesn't affect max; "n" and unknown bounds are linear
+                    seq_type = ComplexityType.LINEAR
             
             # Nested loops: O(f * g) - multiply complexities
             # If we have nested loops, multiply all loops together
-            if nested_loops:
-                nested_complexity = SymbolicComplexity(ComplexityType.CONSTANT)
-                bound_vars = set()
-                has_m = False
+            if has_nested:
+                nested_complexity = _CONST
                 # Multiply all loops (both sequential and nested)
                 for loop in visitor.loops:
-                    if loop.bound_type == "m":
-                        has_m = True
-                        bound_vars.add("m")
-                    if loop.bound_type == "n" or loop.bound_type is None or loop.bound_type == "m":
+                    bound_type = loop.bound_type
+                    if bound_type == "n" or bound_type is None or bound_type == "m":
                         # Default to linear if not specified
-                        nested_complexity = nested_complexity.multiply(
-                            SymbolicComplexity(ComplexityType.LINEAR)
-                        )
-                    elif loop.bound_type == "log n":
-                        nested_complexity = nested_complexity.multiply(
-                            SymbolicComplexity(ComplexityType.LOGARITHMIC)
-                        )
+                        nested_complexity = nested_complexity.multiply(_LINEAR)
+                    elif bound_type == "log n":
+                        nested_complexity = nested_complexity.multiply(_LOGN)
                     # constant bounds don't multiply
                 
                 # If we have different variables (n and m), create multivariate
                 if has_m:
                     vars_dict = {"n": 1, "m": 1}
-                    nested_complexity = SymbolicComplexity(
+                    nested_complexity = SymbolicComplexity.intern(
                         ComplexityType.MULTIVARIATE,
                         vars=vars_dict
                     )
@@ -536,7 +620,7 @@ def compute_time_complexity(visitor: EnhancedCodeVisitor) -> SymbolicComplexity:
                 complexity = complexity.max(nested_complexity)
             else:
                 # Only sequential loops
-                complexity = complexity.max(seq_complexity)
+                complexity = complexity.max(SymbolicComplexity.intern(seq_type))
     
     # 4. Take max of branches (worst case)
     for branch_comp in visitor.branch_complexities:
@@ -550,16 +634,16 @@ def compute_space_complexity(visitor: EnhancedCodeVisitor) -> SymbolicComplexity
     Compute space complexity.
     Includes: recursion stack, auxiliary structures, output space.
     """
-    space = SymbolicComplexity(ComplexityType.CONSTANT)
+    space = _CONST
     
     # 1. Recursion stack depth
     if visitor.recursion_info.branching_factor > 0:
         if visitor.recursion_info.problem_reduction == "n-1":
-            space = SymbolicComplexity(ComplexityType.LINEAR)
+            space = _LINEAR
         elif visitor.recursion_info.problem_reduction == "n/2":
-            space = SymbolicComplexity(ComplexityType.LOGARITHMIC)
+            space = _LOGN
         else:
-            space = SymbolicComplexity(ComplexityType.LINEAR)
+            space = _LINEAR
     
     # 2. Auxiliary data structures
     for aux in visitor.auxiliary_space:
@@ -1,6 +1,17 @@
+import sys
 from dataclasses import dataclass
 
-@dataclass
+# Complexity strings produced by the pattern rules and the heuristic estimator,
+# interned so every result shares one object per complexity class
+O_1 = sys.intern("O(1)")
+O_LOG_N = sys.intern("O(log n)")
+O_SQRT_N = sys.intern("O(sqrt(n))")
+O_N = sys.intern("O(n)")
+O_N_LOG_N = sys.intern("O(n log n)")
+O_2_N = sys.intern("O(2^n)")
+O_UNKNOWN = sys.intern("O(?)")
+
+@dataclass(frozen=True)
 class FunctionAnalysis:
     name: str
     time_complexity: str
@@ -2,8 +2,11 @@
 Symbolic complexity analysis system.
 Handles symbolic expressions, recurrence relations, and proper Big-O calculation.
 """
-from enum import Enum
-from typing import Optional, Dict, Set, List, Tuple
+from enum import Enum, IntEnum
+import math
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Set, List, Tuple, Union
 import re
 
 
@@ -15,223 +18,448 @@ class ComplexityType(Enum):
     LINEAR = "O(n)"
     LINEARITHMIC = "O(n log n)"
     POLYNOMIAL = "O(n^k)"
+    POLYNOMIAL_LOG = "O(n^k log n)"
     EXPONENTIAL = "O(2^n)"
     FACTORIAL = "O(n!)"
     MULTIVARIATE = "O(...)"
 
 
+# Rank of each type for SymbolicComplexity.max: the members above are declared
+# in growth order, 1 < log n < √n < n < n log n < n^k < n^k log n < 2^n < n!
+# (n^k and n^k log n are further ordered by degree, see max)
+_RANK: Dict[ComplexityType, int] = {member: rank for rank, member in enumerate(ComplexityType)}
+# Types that carry a degree, compared by it in SymbolicComplexity.max
+_POWER_TYPES = frozenset({ComplexityType.POLYNOMIAL, ComplexityType.POLYNOMIAL_LOG})
+
+
 class SymbolicComplexity:
-    """Represents a symbolic complexity expression"""
+    """Represents a symbolic complexity expression.
+    
+    Instances are never mutated after construction, so equal ones can be
+    shared: use SymbolicComplexity.intern() rather than the constructor.
+    """
+    
+    __slots__ = ('expr_type', 'base_var', 'degree', 'vars', 'description', '_str', '_hash')
     
     def __init__(self, expr_type: ComplexityType, base_var: str = "n", 
-                 degree: Optional[int] = None, vars: Optional[Dict[str, int]] = None,
+                 degree: Optional[int] = None,
+                 vars: Union[Dict[str, int], Tuple[Tuple[str, int], ...], None] = None,
                  description: str = ""):
         self.expr_type = expr_type
         self.base_var = base_var
         self.degree = degree  # For polynomial: n^k
-        self.vars = vars or {}  # For multivariate: {var: degree}
+        # For multivariate: ((var, degree), ...) sorted by var; dicts are normalized
+        self.vars: Tuple[Tuple[str, int], ...] = (
+            tuple(sorted(vars.items())) if isinstance(vars, dict) else vars or ())
         self.description = description
+        self._str: Optional[str] = None  # rendered on first str()
+        # Structural hash, computed once; description is commentary, not identity
+        self._hash = hash((expr_type, base_var, degree, self.vars))
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __eq__(self, other: object) -> bool:
+        # Interned instances are usually the same object
+        if self is other:
+            return True
+        if not isinstance(other, SymbolicComplexity):
+            return NotImplemented
+        return (self._hash == other._hash
+                and self.expr_type is other.expr_type
+                and self.base_var == other.base_var
+                and self.degree == other.degree
+                and self.vars == other.vars)
+    
+    @classmethod
+    def intern(cls, expr_type: ComplexityType, base_var: str = "n",
+               degree: Optional[int] = None,
+               vars: Optional[Dict[str, int]] = None) -> 'SymbolicComplexity':
+        """Shared instance with these fields, created on first request"""
+        return _interned(expr_type, base_var, degree, tuple(sorted(vars.items())) if vars else ())
     
     def __str__(self) -> str:
         """Convert to Big-O notation string"""
-        if self.expr_type == ComplexityType.CONSTANT:
-            return "O(1)"
-        elif self.expr_type == ComplexityType.LOGARITHMIC:
-            return f"O(log {self.base_var})"
-        elif self.expr_type == ComplexityType.SQRT:
-            return f"O(√{self.base_var})"
-        elif self.expr_type == ComplexityType.LINEAR:
-            return f"O({self.base_var})"
-        elif self.expr_type == ComplexityType.LINEARITHMIC:
-            return f"O({self.base_var} log {self.base_var})"
-        elif self.expr_type == ComplexityType.POLYNOMIAL:
-            if self.degree == 2:
-                return f"O({self.base_var}^2)"
-            return f"O({self.base_var}^{self.degree})"
-        elif self.expr_type == ComplexityType.EXPONENTIAL:
-            return f"O(2^{self.base_var})"
-        elif self.expr_type == ComplexityType.FACTORIAL:
-            return f"O({self.base_var}!)"
-        elif self.expr_type == ComplexityType.MULTIVARIATE:
-            # Build expression like O(n*m) or O(V+E)
-            terms = []
-            for var, deg in sorted(self.vars.items()):
-                if deg == 1:
-                    terms.append(var)
-                else:
-                    terms.append(f"{var}^{deg}")
-            if len(terms) == 1:
-                return f"O({terms[0]})"
-            # Check if multiplication or addition
-            # For now, assume multiplication for different variables
-            return f"O({' * '.join(terms)})"
-        return "O(1)"
+        # Fields never change, so the rendering is computed once per instance
+        text = self._str
+        if text is None:
+            text = _FAST_STR.get((self.expr_type, self.base_var))
+            if text is None:
+                text = _RENDER[self.expr_type](self)
+            self._str = text
+        return text
     
     def max(self, other: 'SymbolicComplexity') -> 'SymbolicComplexity':
         """Take maximum of two complexities (worst case)"""
-        # Order: 1 < log n < √n < n < n log n < n^k < 2^n < n!
-        order = {
-            ComplexityType.CONSTANT: 0,
-            ComplexityType.LOGARITHMIC: 1,
-            ComplexityType.SQRT: 2,
-            ComplexityType.LINEAR: 3,
-            ComplexityType.LINEARITHMIC: 4,
-            ComplexityType.POLYNOMIAL: 5,
-            ComplexityType.EXPONENTIAL: 6,
-            ComplexityType.FACTORIAL: 7,
-            ComplexityType.MULTIVARIATE: 8,
-        }
-        
-        if order.get(self.expr_type, 0) >= order.get(other.expr_type, 0):
+        # O(1) operands are common and usually the shared _CONST instance
+        if self is _CONST:
+            return other
+        if other is _CONST:
+            return self
+        rank = _RANK[self.expr_type]
+        other_rank = _RANK[other.expr_type]
+        # n^k and n^k log n: the degree decides first, then the log factor
+        if self.expr_type in _POWER_TYPES and other.expr_type in _POWER_TYPES:
+            if (other.degree or 0, other_rank) > (self.degree or 0, rank):
+                return other
+            return self
+        # Ties keep self
+        if rank >= other_rank:
             return self
         return other
     
     def multiply(self, other: 'SymbolicComplexity') -> 'SymbolicComplexity':
         """Multiply two complexities (nested execution)"""
+        if self is _CONST:
+            return other
+        if other is _CONST:
+            return self
+        # Operands hash structurally and are immutable, so products are cached
+        return _product(self, other)
+    
+    def _multiply(self, other: 'SymbolicComplexity') -> 'SymbolicComplexity':
         # O(1) * anything = anything
-        if self.expr_type == ComplexityType.CONSTANT:
+        if self.expr_type is ComplexityType.CONSTANT:
             return other
-        if other.expr_type == ComplexityType.CONSTANT:
+        if other.expr_type is ComplexityType.CONSTANT:
             return self
         
         # O(n) * O(n) = O(n^2)
-        if (self.expr_type == ComplexityType.LINEAR and 
-            other.expr_type == ComplexityType.LINEAR and
+        if (self.expr_type is ComplexityType.LINEAR and 
+            other.expr_type is ComplexityType.LINEAR and
             self.base_var == other.base_var):
-            return SymbolicComplexity(ComplexityType.POLYNOMIAL, self.base_var, 2)
+            return _poly(self.base_var, 2)
         
         # O(n) * O(log n) = O(n log n)
-        if (self.expr_type == ComplexityType.LINEAR and 
-            other.expr_type == ComplexityType.LOGARITHMIC and
+        if (self.expr_type is ComplexityType.LINEAR and 
+            other.expr_type is ComplexityType.LOGARITHMIC and
             self.base_var == other.base_var):
-            return SymbolicComplexity(ComplexityType.LINEARITHMIC, self.base_var)
+            return SymbolicComplexity.intern(ComplexityType.LINEARITHMIC, self.base_var)
         
         # O(n) * O(m) = O(n*m)
-        if (self.expr_type == ComplexityType.LINEAR and 
-            other.expr_type == ComplexityType.LINEAR and
+        if (self.expr_type is ComplexityType.LINEAR and 
+            other.expr_type is ComplexityType.LINEAR and
             self.base_var != other.base_var):
-            return SymbolicComplexity(
-                ComplexityType.MULTIVARIATE,
-                vars={self.base_var: 1, other.base_var: 1}
-            )
+            a, b = sorted((self.base_var, other.base_var))
+            return _interned(ComplexityType.MULTIVARIATE, "n", None, ((a, 1), (b, 1)))
         
         # For polynomial, multiply degrees
-        if self.expr_type == ComplexityType.POLYNOMIAL:
-            if other.expr_type == ComplexityType.POLYNOMIAL:
+        if self.expr_type is ComplexityType.POLYNOMIAL:
+            if other.expr_type is ComplexityType.POLYNOMIAL:
                 if self.base_var == other.base_var:
-                    return SymbolicComplexity(
-                        ComplexityType.POLYNOMIAL,
-                        self.base_var,
-                        (self.degree or 1) + (other.degree or 1)
-                    )
+                    return _poly(self.base_var, (self.degree or 1) + (other.degree or 1))
         
         # Default: return the more complex one
         return self.max(other)
     
     def add(self, other: 'SymbolicComplexity') -> 'SymbolicComplexity':
         """Add two complexities (sequential execution)"""
+        if self is _CONST:
+            return other
+        if other is _CONST:
+            return self
         # O(f) + O(g) = O(max(f, g))
         return self.max(other)
 
 
+def _render_polynomial(c: SymbolicComplexity) -> str:
+    if c.degree == 2:
+        return f"O({c.base_var}^2)"
+    return f"O({c.base_var}^{c.degree})"
+
+
+def _render_polynomial_log(c: SymbolicComplexity) -> str:
+    return f"O({c.base_var}^{c.degree} log {c.base_var})"
+
+
+def _render_multivariate(c: SymbolicComplexity) -> str:
+    # Build expression like O(n*m) or O(V+E)
+    terms = []
+    for var, deg in c.vars:
+        if deg == 1:
+            terms.append(var)
+        else:
+            terms.append(f"{var}^{deg}")
+    if len(terms) == 1:
+        return f"O({terms[0]})"
+    # Check if multiplication or addition
+    # For now, assume multiplication for different variables
+    return f"O({' * '.join(terms)})"
+
+
+# Big-O rendering for each complexity type, used by SymbolicComplexity.__str__
+_RENDER = {
+    ComplexityType.CONSTANT: lambda c: "O(1)",
+    ComplexityType.LOGARITHMIC: lambda c: f"O(log {c.base_var})",
+    ComplexityType.SQRT: lambda c: f"O(√{c.base_var})",
+    ComplexityType.LINEAR: lambda c: f"O({c.base_var})",
+    ComplexityType.LINEARITHMIC: lambda c: f"O({c.base_var} log {c.base_var})",
+    ComplexityType.POLYNOMIAL: _render_polynomial,
+    ComplexityType.POLYNOMIAL_LOG: _render_polynomial_log,
+    ComplexityType.EXPONENTIAL: lambda c: f"O(2^{c.base_var})",
+    ComplexityType.FACTORIAL: lambda c: f"O({c.base_var}!)",
+    ComplexityType.MULTIVARIATE: _render_multivariate,
+}
+
+# Ready-made strings for the fixed-shape types over n, the usual variable
+_FAST_STR = {
+    (ComplexityType.CONSTANT, "n"): "O(1)",
+    (ComplexityType.LOGARITHMIC, "n"): "O(log n)",
+    (ComplexityType.SQRT, "n"): "O(√n)",
+    (ComplexityType.LINEAR, "n"): "O(n)",
+    (ComplexityType.LINEARITHMIC, "n"): "O(n log n)",
+    (ComplexityType.EXPONENTIAL, "n"): "O(2^n)",
+    (ComplexityType.FACTORIAL, "n"): "O(n!)",
+}
+
+
+@lru_cache(maxsize=1024)
+def _product(a: SymbolicComplexity, b: SymbolicComplexity) -> SymbolicComplexity:
+    return a._multiply(b)
+
+
+@lru_cache(maxsize=4096)
+def _interned(expr_type: ComplexityType, base_var: str, degree: Optional[int],
+              vars_items: Tuple[Tuple[str, int], ...]) -> SymbolicComplexity:
+    return SymbolicComplexity(expr_type, base_var, degree, vars_items)
+
+
+# base_var -> degree -> interned POLYNOMIAL, so degree merges are two dict lookups
+_POLY_TABLE: Dict[str, Dict[int, SymbolicComplexity]] = {}
+
+
+def _poly(base_var: str, degree: int) -> SymbolicComplexity:
+    table = _POLY_TABLE.get(base_var)
+    if table is None:
+        table = _POLY_TABLE[base_var] = {}
+    result = table.get(degree)
+    if result is None:
+        result = table[degree] = SymbolicComplexity.intern(
+            ComplexityType.POLYNOMIAL, base_var, degree)
+    return result
+
+
+# Shared instances for the complexities the solver and cost table produce
+_CONST = SymbolicComplexity.intern(ComplexityType.CONSTANT)
+_LOGN = SymbolicComplexity.intern(ComplexityType.LOGARITHMIC)
+_SQRT = SymbolicComplexity.intern(ComplexityType.SQRT)
+_LINEAR = SymbolicComplexity.intern(ComplexityType.LINEAR)
+_NLOGN = SymbolicComplexity.intern(ComplexityType.LINEARITHMIC)
+_EXP = SymbolicComplexity.intern(ComplexityType.EXPONENTIAL)
+_FACT = SymbolicComplexity.intern(ComplexityType.FACTORIAL)
+
+
+class Reduction(IntEnum):
+    """How a recursive call shrinks the problem, parsed from strings like "n-1" """
+    OTHER = 0
+    N_MINUS_1 = 1      # "n-1"
+    N_OVER_2 = 2       # "n/2"
+    N_OVER_K = 3       # any other "n/..."
+    INDEX_PLUS_1 = 4   # "index+1"
+
+
+# One pattern for every reduction shape; "div" is whatever follows "n/"
+_REDUCTION_RE = re.compile(r"(?P<n1>n-1)|(?P<idx>index\+1)|n/(?P<div>.*)", re.DOTALL)
+
+
+@lru_cache(maxsize=256)
+def _parse_reduction(problem_reduction: str) -> Reduction:
+    match = _REDUCTION_RE.fullmatch(problem_reduction)
+    if match is None:
+        return Reduction.OTHER
+    kind = match.lastgroup
+    if kind == "div":
+        return Reduction.N_OVER_2 if match["div"] == "2" else Reduction.N_OVER_K
+    return Reduction.N_MINUS_1 if kind == "n1" else Reduction.INDEX_PLUS_1
+
+
+@lru_cache(maxsize=256)
+def _reduction_divisor(problem_reduction: Union[str, Reduction]) -> Optional[float]:
+    """b in a reduction to n/b, or None if b is not a number greater than 1"""
+    if problem_reduction is Reduction.N_OVER_2:
+        return 2.0
+    if isinstance(problem_reduction, Reduction):
+        return None
+    match = _REDUCTION_RE.fullmatch(problem_reduction)
+    if match is None or match.lastgroup != "div":
+        return None
+    try:
+        divisor = float(match["div"])
+    except ValueError:
+        # Symbolic divisor such as n/k
+        return None
+    return divisor if divisor > 1 and math.isfinite(divisor) else None
+
+
+def _power(degree: float) -> SymbolicComplexity:
+    """n^degree for degree > 0, as the named type where there is one.
+    
+    Other exponents are rounded up to the smallest type here that bounds them
+    (n^0.63 is O(n), n^1.58 is O(n^2)), so degrees stay integral.
+    """
+    if abs(degree - 0.5) < _MASTER_EPS or degree < 0.5:
+        return _SQRT
+    if degree < 1 + _MASTER_EPS:
+        return _LINEAR
+    nearest = round(degree)
+    if abs(degree - nearest) < _MASTER_EPS:
+        return _poly("n", nearest)
+    return _poly("n", math.ceil(degree))
+
+
+# Tolerance when comparing log_b(a) with the work exponent
+_MASTER_EPS = 1e-9
+
+
+def _master_theorem(a: int, b: float, work: SymbolicComplexity) -> Optional[SymbolicComplexity]:
+    """
+    Solve T(n) = a T(n/b) + O(n^c) by the Master Theorem.
+    Returns None when the work is not a plain power of n.
+    """
+    if work.expr_type is ComplexityType.CONSTANT:
+        c = 0
+    elif work.expr_type is ComplexityType.LINEAR:
+        c = 1
+    elif work.expr_type is ComplexityType.POLYNOMIAL and work.degree:
+        c = work.degree
+    else:
+        return None
+    
+    critical = math.log(a) / math.log(b)
+    if critical > c + _MASTER_EPS:
+        # Leaves dominate: n^(log_b a)
+        return _power(critical)
+    if critical < c - _MASTER_EPS:
+        # Root work dominates: n^c. c > 0 here, since log_b a >= 0
+        return _power(c)
+    # Balanced: n^c log n
+    if c == 0:
+        return _LOGN
+    if c == 1:
+        return _NLOGN
+    return SymbolicComplexity.intern(ComplexityType.POLYNOMIAL_LOG, "n", c)
+
+
 class RecurrenceSolver:
     """Solves recurrence relations to determine complexity"""
     
     @staticmethod
+    @lru_cache(maxsize=1024)
     def solve(recurrence_type: str, branching_factor: int, 
-              problem_reduction: str, work_per_level: Optional[SymbolicComplexity] = None) -> SymbolicComplexity:
+              problem_reduction: Union[str, Reduction], work_per_level: Optional[SymbolicComplexity] = None) -> SymbolicComplexity:
         """
         Solve recurrence relations.
         
         recurrence_type: "linear", "divide_conquer", "backtracking"
         branching_factor: number of recursive calls per frame
-        problem_reduction: "n-1", "n/2", "n/k", "index+1"
+        problem_reduction: "n-1", "n/2", "n/k", "index+1", or the Reduction for one
         work_per_level: work done at each level (for divide & conquer)
+        
+        Pure in its arguments (work_per_level hashes structurally), so results
+        are cached.
         """
-        work = work_per_level or SymbolicComplexity(ComplexityType.CONSTANT)
+        work = work_per_level or _CONST
+        reduction = (problem_reduction if isinstance(problem_reduction, Reduction)
+                     else _parse_reduction(problem_reduction))
         
         if recurrence_type == "linear":
             # T(n) = T(n-1) + O(1) → O(n) (single call)
-            if problem_reduction == "n-1":
+            if reduction is Reduction.N_MINUS_1:
                 if branching_factor == 1:
-                    return SymbolicComplexity(ComplexityType.LINEAR)
+                    return _LINEAR
                 # T(n) = 2T(n-1) → O(2^n) (multiple calls)
                 elif branching_factor >= 2:
-                    return SymbolicComplexity(ComplexityType.EXPONENTIAL)
+                    return _EXP
             # T(n) = T(n/k) + O(1) → O(log n)
-            if problem_reduction.startswith("n/"):
-                return SymbolicComplexity(ComplexityType.LOGARITHMIC)
+            if reduction is Reduction.N_OVER_2 or reduction is Reduction.N_OVER_K:
+                return _LOGN
         
         elif recurrence_type == "divide_conquer":
+            # T(n) = aT(n/b) + O(n^c): Master Theorem when b and c are known
+            divisor = _reduction_divisor(problem_reduction)
+            if divisor is not None and branching_factor >= 1:
+                solved = _master_theorem(branching_factor, divisor, work)
+                if solved is not None:
+                    return solved
+            
+            # Otherwise the common shapes
             # T(n) = 2T(n/2) + O(n) → O(n log n)
-            if branching_factor == 2 and problem_reduction == "n/2":
+            if branching_factor == 2 and reduction is Reduction.N_OVER_2:
                 if work.expr_type == ComplexityType.LINEAR:
-                    return SymbolicComplexity(ComplexityType.LINEARITHMIC)
+                    return _NLOGN
                 if work.expr_type == ComplexityType.CONSTANT:
-                    return SymbolicComplexity(ComplexityType.LINEAR)
+                    return _LINEAR
             
             # T(n) = T(n/2) + O(1) → O(log n)
-            if branching_factor == 1 and problem_reduction == "n/2":
-                return SymbolicComplexity(ComplexityType.LOGARITHMIC)
+            if branching_factor == 1 and reduction is Reduction.N_OVER_2:
+                return _LOGN
         
         elif recurrence_type == "backtracking":
             # T(n) = kT(n-1) → O(k^n)
-            if problem_reduction == "n-1":
+            if reduction is Reduction.N_MINUS_1:
                 if branching_factor == 2:
-                    return SymbolicComplexity(ComplexityType.EXPONENTIAL)
+                    return _EXP
                 if branching_factor > 2:
-                    return SymbolicComplexity(ComplexityType.EXPONENTIAL)  # O(k^n)
+                    return _EXP  # O(k^n)
             
             # T(n) = nT(n-1) → O(n!)
-            if problem_reduction == "n-1" and branching_factor > 10:  # Heuristic for n!
-                return SymbolicComplexity(ComplexityType.FACTORIAL)
+            if reduction is Reduction.N_MINUS_1 and branching_factor > 10:  # Heuristic for n!
+                return _FACT
         
         # For linear recurrence with 2+ branches and n-1 reduction → exponential
         if recurrence_type == "linear" and branching_factor >= 2:
-            if problem_reduction == "n-1":
+            if reduction is Reduction.N_MINUS_1:
                 # T(n) = 2T(n-1) → O(2^n)
-                return SymbolicComplexity(ComplexityType.EXPONENTIAL)
+                return _EXP
         
         # Default fallback
         if branching_factor >= 2:
-            return SymbolicComplexity(ComplexityType.EXPONENTIAL)
-        return SymbolicComplexity(ComplexityType.LINEAR)
+            return _EXP
+        return _LINEAR
 
 
 class DataStructureCosts:
     """Built-in cost table for data structure operations"""
     
-    COSTS = {
+    __slots__ = ()  # namespace for the table; never instantiated with state
+    
+    # Read-only: entries are shared, interned instances
+    COSTS = MappingProxyType({
         # List operations
-        'list.append': SymbolicComplexity(ComplexityType.CONSTANT),
-        'list.pop': SymbolicComplexity(ComplexityType.CONSTANT),  # end
-        'list.pop(0)': SymbolicComplexity(ComplexityType.LINEAR),  # beginning
-        'list.insert(0)': SymbolicComplexity(ComplexityType.LINEAR),
-        'list.sort': SymbolicComplexity(ComplexityType.LINEARITHMIC),
-        'list.index': SymbolicComplexity(ComplexityType.LINEAR),
-        'list.count': SymbolicComplexity(ComplexityType.LINEAR),
+        'list.append': _CONST,
+        'list.pop': _CONST,  # end
+        'list.pop(0)': _LINEAR,  # beginning
+        'list.insert(0)': _LINEAR,
+        'list.sort': _NLOGN,
+        'list.index': _LINEAR,
+        'list.count': _LINEAR,
         
         # Dict/Set operations
-        'dict.get': SymbolicComplexity(ComplexityType.CONSTANT),
-        'dict.set': SymbolicComplexity(ComplexityType.CONSTANT),
-        'dict.__getitem__': SymbolicComplexity(ComplexityType.CONSTANT),
-        'dict.__setitem__': SymbolicComplexity(ComplexityType.CONSTANT),
-        'set.add': SymbolicComplexity(ComplexityType.CONSTANT),
-        'set.remove': SymbolicComplexity(ComplexityType.CONSTANT),
-        'set.intersection': SymbolicComplexity(ComplexityType.LINEAR),
+        'dict.get': _CONST,
+        'dict.set': _CONST,
+        'dict.__getitem__': _CONST,
+        'dict.__setitem__': _CONST,
+        'set.add': _CONST,
+        'set.remove': _CONST,
+        'set.intersection': _LINEAR,
         
         # String operations
-        'str.find': SymbolicComplexity(ComplexityType.LINEAR),
-        'str.replace': SymbolicComplexity(ComplexityType.LINEAR),
-        'str.split': SymbolicComplexity(ComplexityType.LINEAR),
+        'str.find': _LINEAR,
+        'str.replace': _LINEAR,
+        'str.split': _LINEAR,
         
         # Built-in functions
-        'sorted': SymbolicComplexity(ComplexityType.LINEARITHMIC),
-        'max': SymbolicComplexity(ComplexityType.LINEAR),
-        'min': SymbolicComplexity(ComplexityType.LINEAR),
-        'sum': SymbolicComplexity(ComplexityType.LINEAR),
-        'len': SymbolicComplexity(ComplexityType.CONSTANT),
-    }
+        'sorted': _NLOGN,
+        'max': _LINEAR,
+        'min': _LINEAR,
+        'sum': _LINEAR,
+        'len': _CONST,
+    })
+    
+    # Method names and bare builtins that have an entry in COSTS, so callers can
+    # rule out a lookup before building the "obj.attr" key
+    KNOWN_ATTRS = frozenset(op.rpartition('.')[2] for op in COSTS if '.' in op)
+    KNOWN_BUILTINS = frozenset(op for op in COSTS if '.' not in op)
     
     @staticmethod
     def get_cost(operation: str) -> Optional[SymbolicComplexity]:
@@ -239,24 +467,39 @@ class DataStructureCosts:
         return DataStructureCosts.COSTS.get(operation)
 
 
+# Bound lookup on the cost table, for hot call sites that would otherwise go
+# through the class attribute and get_cost on every call
+get_operation_cost = DataStructureCosts.COSTS.get
+
+
+# Whole (lowercased) names with a fixed size variable
+_EXACT_SIZE_NAMES = {'g': 'V', 'm': 'm', 'k': 'k'}
+
+
+@lru_cache(maxsize=2048)
 def infer_input_size(param_name: str, param_type: Optional[str] = None) -> str:
     """
     Infer symbolic input size variable from parameter name/type.
     Returns: 'n', 'm', 'V', 'E', etc.
+    
+    Parameter names repeat across a codebase, so answers are cached.
     """
     name_lower = param_name.lower()
     
-    # Common conventions
-    if 'graph' in name_lower or 'g' == name_lower:
+    # Common conventions. The substring checks take precedence over each other
+    # in this order ("edge_graph" is a graph), and over the suffix checks
+    exact = _EXACT_SIZE_NAMES.get(name_lower)
+    if exact is not None:
+        # None of these single letters can contain the substrings below
+        return exact
+    if 'graph' in name_lower:
         return 'V'  # vertices
-    if 'edge' in name_lower or 'edges' in name_lower:
+    if 'edge' in name_lower:
         return 'E'
     if 'matrix' in name_lower or 'grid' in name_lower:
         return 'n'  # Could be n*m, but start with n
-    if 'm' == name_lower or name_lower.endswith('_m'):
-        return 'm'
-    if 'k' == name_lower or name_lower.endswith('_k'):
-        return 'k'
+    if name_lower.endswith(('_m', '_k')):
+        return name_lower[-1]
     
     # Default: n for arrays, lists, strings
     return 'n'
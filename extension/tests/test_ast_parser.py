@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from analyzer import ast_parser
+from analyzer.ast_parser import analyze_source, analyze_sources, detect_patterns_ast
+
+
+class AnalyzeSourceTest(unittest.TestCase):
+    def setUp(self):
+        # Keep results off the user's cache and away from the LLM
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        for patcher in (
+            mock.patch.object(ast_parser, "CACHE_DIR", Path(cache_dir.name)),
+            mock.patch.object(ast_parser, "get_complexity_from_llm", return_value=None),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        ast_parser._RESULT_CACHE.clear()
+
+    def time_of(self, source):
+        return analyze_source(source)[0].time_complexity
+
+
+class TrivialSnippetTest(AnalyzeSourceTest):
+    def test_plain_assignments_are_constant(self):
+        self.assertEqual(self.time_of("x = 1\ny = x"), "O(1)")
+        self.assertEqual(self.time_of("d = {1: 2}"), "O(1)")
+
+    def test_operand_sized_expressions_are_not_constant(self):
+        for source in ("c = a + b", "x = a * n", "ok = a == b", "d2 = {**d}",
+                       "s = {*xs}", "def g():\n    yield from gen"):
+            with self.subTest(source=source):
+                self.assertEqual(self.time_of(source), "O(?)")
+
+    def test_invalid_syntax_is_unknown(self):
+        self.assertEqual(self.time_of("x = = 1"), "O(?)")
+
+
+class RecursionFrameTest(unittest.TestCase):
+    def test_nested_def_keeps_enclosing_call_count(self):
+        # The helper's frame is popped after its body, so both self-calls
+        # count against f and make it branching recursion
+        source = (
+            "def f(n):\n"
+            "    if n <= 1:\n"
+            "        return n\n"
+            "    a = f(n - 1)\n"
+            "    def helper(x):\n"
+            "        return x\n"
+            "    b = f(n - 2)\n"
+            "    return a + b\n"
+        )
+        self.assertEqual(detect_patterns_ast(source), ("O(2^n)", "O(n)", 0, 2))
+
+
+class AsyncRecursionTest(unittest.TestCase):
+    def test_async_self_call_is_recursion(self):
+        source = (
+            "async def f(n):\n"
+            "    if n == 0:\n"
+            "        return 0\n"
+            "    return await f(n - 1)\n"
+        )
+        self.assertEqual(detect_patterns_ast(source), ("O(n)", "O(n)", 0, 1))
+
+    def test_async_branching_recursion(self):
+        source = (
+            "async def f(n):\n"
+            "    if n < 2:\n"
+            "        return n\n"
+            "    return await f(n - 1) + await f(n - 2)\n"
+        )
+        self.assertEqual(detect_patterns_ast(source), ("O(2^n)", "O(n)", 0, 2))
+
+
+class UndecodableSourceTest(AnalyzeSourceTest):
+    def test_lone_surrogates_do_not_raise(self):
+        # What stdin's surrogateescape decoding makes of a non-UTF-8 byte
+        source = 'x = "\udcff"\nfor i in range(n):\n    pass\n'
+        self.assertEqual(len(analyze_source(source)), 1)
+
+
+class AnalyzeSourcesTest(AnalyzeSourceTest):
+    def test_results_keep_input_order(self):
+        loop = "for i in range(n):\n    print(i)\n"
+        sort = "def f(a):\n    a.sort()\n    return a\n"
+        # Workers may re-import the module, so switch their disk cache off too
+        with mock.patch.dict(os.environ, BIG_O_TRACKER_NO_CACHE="1"):
+            results = analyze_sources([loop, sort, loop, sort])
+        self.assertEqual([r[0].time_complexity for r in results],
+                         ["O(n)", "O(n log n)", "O(n)", "O(n log n)"])
+
+
+if __name__ == "__main__":
+    unittest.main()
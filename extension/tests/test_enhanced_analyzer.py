@@ -0,0 +1,69 @@
+import ast
+import unittest
+
+from analyzer.complexity import estimate_space_complexity, estimate_time_complexity
+from analyzer.enhanced_analyzer import EnhancedCodeVisitor, compute_time_complexity
+
+
+def visit(source, name="f"):
+    """Visitor after walking the first def in source."""
+    visitor = EnhancedCodeVisitor(name)
+    visitor.visit(ast.parse(source).body[0])
+    return visitor
+
+
+class RecursiveCallCountTest(unittest.TestCase):
+    def test_call_nested_in_keyword_argument_counts_once(self):
+        visitor = visit(
+            "def f(n):\n"
+            "    if n == 0:\n"
+            "        return 0\n"
+            "    return g(x=f(n - 1))\n"
+        )
+        self.assertEqual(visitor.recursion_info.branching_factor, 1)
+        self.assertEqual(str(compute_time_complexity(visitor)), "O(n)")
+
+    def test_calls_nested_in_one_call_count_once_each(self):
+        visitor = visit(
+            "def f(n):\n"
+            "    if n < 2:\n"
+            "        return n\n"
+            "    return max(f(n-1), f(n-2))\n"
+        )
+        self.assertEqual(visitor.recursion_info.branching_factor, 2)
+        self.assertEqual(str(compute_time_complexity(visitor)), "O(2^n)")
+
+
+class AsyncDefTest(unittest.TestCase):
+    def test_async_def_is_analyzed_like_def(self):
+        visitor = visit(
+            "async def f(n):\n"
+            "    if n == 0:\n"
+            "        return 0\n"
+            "    return await f(n - 1)\n"
+        )
+        self.assertEqual(visitor.recursion_info.branching_factor, 1)
+        self.assertEqual(str(compute_time_complexity(visitor)), "O(n)")
+
+
+class RenderedComplexityTest(unittest.TestCase):
+    def test_estimates_use_the_visitor_rendering(self):
+        visitor = visit("def f(a):\n    for x in a:\n        pass\n")
+        self.assertEqual(estimate_time_complexity(1, 0, enhanced_visitor=visitor), "O(n)")
+        self.assertEqual(estimate_space_complexity(0, 1, enhanced_visitor=visitor), "O(1)")
+
+    def test_walking_more_code_renders_again(self):
+        visitor = visit("def f(a):\n    for x in a:\n        pass\n")
+        self.assertEqual(visitor.time_str(), "O(n)")
+        visitor.visit(ast.parse("a.sort()"))
+        self.assertEqual(visitor.time_str(), "O(n log n)")
+
+    def test_reset_clears_the_rendering(self):
+        visitor = visit("def f(a):\n    a.sort()\n")
+        self.assertEqual(visitor.time_str(), "O(n log n)")
+        visitor.reset("g")
+        self.assertEqual(visitor.time_str(), "O(1)")
+
+
+if __name__ == "__main__":
+    unittest.main()
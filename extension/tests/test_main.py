@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Directory holding the analyzer package, run as "python -m analyzer.main"
+EXTENSION_DIR = Path(__file__).resolve().parent.parent
+
+
+class MainTest(unittest.TestCase):
+    def run_main(self, stdin: bytes, **env_vars: str) -> subprocess.CompletedProcess:
+        with tempfile.TemporaryDirectory() as cache_home:
+            env = dict(os.environ, XDG_CACHE_HOME=cache_home, **env_vars)
+            env.pop("GROQ_API_KEY", None)
+            proc = subprocess.run(
+                [sys.executable, "-m", "analyzer.main"], input=stdin,
+                capture_output=True, cwd=EXTENSION_DIR, env=env,
+            )
+            self.cache_files = sorted(Path(cache_home).rglob("*.json"))
+            return proc
+
+    def test_non_utf8_byte_still_prints_json(self):
+        proc = self.run_main(b'x = "\xff"\nfor i in range(n):\n    pass\n')
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stderr, b"")
+        self.assertEqual(len(json.loads(proc.stdout)), 1)
+
+    def test_results_are_cached_on_disk(self):
+        self.run_main(b"for i in range(n):\n    print(i)\n")
+        self.assertEqual(len(self.cache_files), 1)
+
+    def test_no_cache_switch_disables_the_disk_cache(self):
+        proc = self.run_main(b"for i in range(n):\n    print(i)\n",
+                             BIG_O_TRACKER_NO_CACHE="1")
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(self.cache_files, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
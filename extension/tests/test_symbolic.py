@@ -0,0 +1,59 @@
+import unittest
+
+from analyzer.symbolic import ComplexityType, RecurrenceSolver, SymbolicComplexity
+
+LINEAR = SymbolicComplexity.intern(ComplexityType.LINEAR)
+NLOGN = SymbolicComplexity.intern(ComplexityType.LINEARITHMIC)
+N2 = SymbolicComplexity.intern(ComplexityType.POLYNOMIAL, "n", 2)
+N3 = SymbolicComplexity.intern(ComplexityType.POLYNOMIAL, "n", 3)
+
+
+class MasterTheoremTest(unittest.TestCase):
+    def test_square_root_exponent_is_sqrt(self):
+        # T(n) = 2T(n/4) + O(1) -> n^(log_4 2) = √n
+        result = RecurrenceSolver.solve("divide_conquer", 2, "n/4")
+        self.assertIs(result.expr_type, ComplexityType.SQRT)
+        self.assertEqual(str(result), "O(√n)")
+
+    def test_sublinear_exponent_rounds_up_to_linear(self):
+        # T(n) = 2T(n/3) + O(1) -> n^0.63, bounded by O(n)
+        result = RecurrenceSolver.solve("divide_conquer", 2, "n/3")
+        self.assertIs(result.expr_type, ComplexityType.LINEAR)
+
+    def test_fractional_exponent_keeps_integral_degree(self):
+        # T(n) = 3T(n/2) + O(1) -> n^1.58, bounded by O(n^2)
+        result = RecurrenceSolver.solve("divide_conquer", 3, "n/2")
+        self.assertIs(result.expr_type, ComplexityType.POLYNOMIAL)
+        self.assertEqual(result.degree, 2)
+        self.assertIsInstance(result.degree, int)
+        self.assertEqual(str(result.multiply(result)), "O(n^4)")
+
+    def test_balanced_polynomial_work_adds_log_factor(self):
+        # T(n) = 4T(n/2) + O(n^2) -> n^2 log n
+        result = RecurrenceSolver.solve("divide_conquer", 4, "n/2", N2)
+        self.assertIs(result.expr_type, ComplexityType.POLYNOMIAL_LOG)
+        self.assertEqual(str(result), "O(n^2 log n)")
+
+
+class MaxTest(unittest.TestCase):
+    def test_sqrt_below_linear_and_linearithmic(self):
+        sqrt = RecurrenceSolver.solve("divide_conquer", 2, "n/4")
+        self.assertIs(sqrt.max(LINEAR), LINEAR)
+        self.assertIs(sqrt.max(NLOGN), NLOGN)
+
+    def test_sublinear_power_below_linearithmic(self):
+        sublinear = RecurrenceSolver.solve("divide_conquer", 2, "n/3")
+        self.assertIs(sublinear.max(NLOGN), NLOGN)
+
+    def test_polynomials_compare_by_degree(self):
+        self.assertIs(N2.max(N3), N3)
+        self.assertIs(N3.max(N2), N3)
+
+    def test_log_factor_ranks_between_degrees(self):
+        n2_log = RecurrenceSolver.solve("divide_conquer", 4, "n/2", N2)
+        self.assertIs(N2.max(n2_log), n2_log)
+        self.assertIs(n2_log.max(N3), N3)
+
+
+if __name__ == "__main__":
+    unittest.main()